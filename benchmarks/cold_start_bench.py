@@ -0,0 +1,118 @@
+"""
+Cold-start benchmark for api/analyze.py.
+
+Each run starts a fresh interpreter, as a serverless cold start would:
+
+  * ``python -X importtime`` imports the module and the import time is
+    broken down by the packages it imports, so a new eager import shows up.
+  * A second interpreter imports the module, builds the Gemini and Tavily
+    clients through their accessors, then serves two requests with the
+    fixture replay clients (no network) and times the first (cold) against
+    the second (warm).
+
+Usage:
+    python benchmarks/cold_start_bench.py
+    python benchmarks/cold_start_bench.py --runs 10 --top 15
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+import common
+
+IMPORT_SNIPPET = "import sys; sys.path.insert(0, {api!r}); import analyze"
+
+
+def importtime(runs: int) -> tuple[list[float], list[float], dict]:
+    """Wall and import times (ms) per run, and mean cumulative ms per package analyze imports."""
+    api_dir = os.path.join(common.ROOT, "api")
+    walls, totals = [], []
+    packages = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET.format(api=api_dir)],
+                              capture_output=True, text=True, env=os.environ, check=True)
+        walls.append((time.perf_counter() - start) * 1000)
+        for line in proc.stderr.splitlines():
+            # "import time:      self [us] |  cumulative | imported package"
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip())) // 2  # one space, then two per nesting level
+            if name.strip() == "analyze" and depth == 0:
+                totals.append(int(cumulative) / 1000)
+            elif depth == 1:  # imported directly by analyze (or by site at startup)
+                packages.setdefault(name.strip(), []).append(int(cumulative) / 1000)
+    return walls, totals, {name: sum(ms) / runs for name, ms in packages.items()}
+
+
+def child() -> None:
+    """Run inside a fresh interpreter: time import, client setup and two requests."""
+    timings = {}
+    start = time.perf_counter()
+    analyze = common.load_api_module()
+    timings["import"] = time.perf_counter() - start
+
+    from scout import warm_state
+    from scout.llm import get_gemini_client
+    from scout.search import get_tavily_client
+    start = time.perf_counter()
+    get_gemini_client()
+    get_tavily_client()
+    timings["clients"] = time.perf_counter() - start
+
+    from fastapi.testclient import TestClient
+    from replay import Faults, Replay
+    replay = Replay(Faults(latency=0.0, jitter=0.0))
+    warm_state["gemini_client"], warm_state["tavily_client"] = replay.async_clients()
+    with TestClient(analyze.app) as client:
+        for label in ("first_request", "warm_request"):
+            start = time.perf_counter()
+            response = client.post("/api/analyze", json={"description": "Senior Python engineer, Django, AWS"})
+            timings[label] = time.perf_counter() - start
+            response.raise_for_status()
+    print(json.dumps(timings))
+
+
+def first_requests(runs: int) -> dict:
+    samples = {}
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"],
+                              capture_output=True, text=True, env=os.environ, check=True)
+        for label, seconds in json.loads(proc.stdout.strip().splitlines()[-1]).items():
+            samples.setdefault(label, []).append(seconds * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    walls, totals, packages = importtime(args.runs)
+    print(f"import api/analyze.py ({args.runs} fresh interpreters, -X importtime):")
+    print(f"  import:      median {statistics.median(totals):7.1f} ms, max {max(totals):7.1f} ms")
+    print(f"  interpreter: median {statistics.median(walls):7.1f} ms (startup + import + exit)")
+    print("  slowest direct imports (mean cumulative):")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"    {ms:8.1f} ms  {name}")
+
+    samples = first_requests(args.runs)
+    print("first request (fixture replay, no network):")
+    for label in ("import", "clients", "first_request", "warm_request"):
+        values = samples[label]
+        print(f"  {label:<14} median {statistics.median(values):7.1f} ms, max {max(values):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Shared helpers for the offline benchmarks."""
+import os
+import sys
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The agent modules build real clients (at import or on first use); give them dummy keys.
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+# Measure real upstream round trips, not cache hits
+os.environ.setdefault("GEMINI_CACHE_BACKEND", "none")
+os.environ.setdefault("TAVILY_CACHE_BACKEND", "none")
+os.environ.setdefault("CANDIDATE_STORE_PATH", "none")
+os.environ.setdefault("VECTOR_STORE_PATH", "none")
+os.environ.setdefault("JOB_QUEUE_PATH", "none")
+# The stubs never throttle; keep the local per-model budget out of the way
+os.environ.setdefault("GEMINI_RPM", "0")
+
+
+def load_api_module():
+    """Import api/analyze.py (the Vercel entry point) as a module."""
+    if "analyze" in sys.modules:
+        return sys.modules["analyze"]
+    spec = importlib.util.spec_from_file_location("analyze", os.path.join(ROOT, "api", "analyze.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["analyze"] = module
+    spec.loader.exec_module(module)
+    return module
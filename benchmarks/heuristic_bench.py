@@ -0,0 +1,81 @@
+"""
+Heuristic scorer benchmark.
+
+Scores synthetic candidate pools with the original per-candidate
+``_heuristic_score`` (see legacy_heuristic.py) and with
+``HeuristicScorer.score_many``, and reports throughput for each. The
+scorer is timed cold and again with its (query, url) memo warm.
+
+Usage:
+    python benchmarks/heuristic_bench.py --sizes 100 1000 5000
+"""
+import time
+import random
+import argparse
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+import legacy_heuristic
+
+QUERY = "Senior full stack engineer with Python, React and AWS experience, fintech startup"
+
+_FIRST = ["Asha", "Ben", "Chen", "Dana", "Elif", "Farah", "Goran", "Hiro", "Ines", "Jon"]
+_LAST = ["Kumar", "Lopez", "Martin", "Nakamura", "Okafor", "Petrov", "Quinn", "Rossi"]
+_ROLES = ["Software Engineer", "Product Designer", "Data Scientist", "Full Stack Developer",
+          "DevOps Engineer", "UI/UX Designer", "Backend Developer", "Marketing Manager"]
+_COMPANIES = ["Stripe", "Acme Corp", "Globex", "Initech", "Hooli", "Umbrella Labs"]
+_SKILLS = ["Python", "React", "AWS", "Docker", "Kubernetes", "Figma", "Node.js", "PostgreSQL",
+           "Machine Learning", "TypeScript", "Go", "CI/CD", "Tableau", "SEO", "Full-stack"]
+_FILLER = ("Passionate about building products people love. People also viewed. "
+           "Show more. Experienced in cross-functional collaboration and mentoring. ")
+
+
+def make_candidates(n: int, seed: int = 7) -> list:
+    from scout.candidate import CandidateRecord
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        name = f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+        role = rng.choice(_ROLES)
+        skills = ", ".join(rng.sample(_SKILLS, 5))
+        content = (f"{name} is a {role} with {rng.randint(1, 15)} years of experience "
+                   f"working at {rng.choice(_COMPANIES)}. Skills: {skills}. "
+                   + _FILLER * rng.randint(1, 12))
+        candidates.append(CandidateRecord(
+            url=f"https://www.linkedin.com/in/candidate-{i}",
+            title=f"{name} - {role} | LinkedIn",
+            content=content,
+        ))
+    return candidates
+
+
+def bench(label: str, fn, candidates: list) -> float:
+    start = time.perf_counter()
+    fn(candidates)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms   {len(candidates) / elapsed:10.0f} candidates/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    from scout import heuristic
+    legacy_heuristic._build_personalized_reason = heuristic._build_personalized_reason
+
+    for n in args.sizes:
+        candidates = make_candidates(n)
+        print(f"{n} candidates:")
+        # The legacy scorer reads plain dicts
+        legacy_pool = [{"title": c.title, "url": c.url, "content": c.content} for c in candidates]
+        legacy = bench("legacy _heuristic_score", lambda cs: [legacy_heuristic._heuristic_score(QUERY, c) for c in cs],
+                       legacy_pool)
+        heuristic.heuristic_memo.clear()
+        batched = bench("HeuristicScorer.score_many", lambda cs: heuristic.HeuristicScorer(QUERY).score_many(cs), candidates)
+        memoized = bench("  repeat (memoized)", lambda cs: heuristic.HeuristicScorer(QUERY).score_many(cs), candidates)
+        print(f"  speedup: {legacy / batched:.1f}x cold, {legacy / memoized:.1f}x memoized")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Local BM25 index benchmark.
+
+Builds the local candidate index over synthetic profile pools and reports
+build time, query latency (p50/p95) and how many queries would have been
+answered without calling Tavily. The synthetic profiles share a small
+vocabulary, so postings lists are long; treat query latency as a worst case.
+
+Usage:
+    python benchmarks/index_bench.py --sizes 10000 100000 --queries 200
+"""
+import time
+import random
+import argparse
+import statistics
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from heuristic_bench import make_candidates
+
+QUERIES = [
+    "Senior full stack engineer with Python, React and AWS experience",
+    "Product designer with Figma and design systems background",
+    "Data scientist, machine learning, PyTorch, fintech",
+    "DevOps engineer Kubernetes Docker CI/CD",
+    "Marketing manager SEO content strategy",
+    "Backend developer Go PostgreSQL microservices",
+    "UI/UX designer for mobile apps",
+    "TypeScript Node.js engineer at a startup",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    from scout.index import LOCAL_MIN_RESULTS, LocalCandidateIndex
+    rng = random.Random(11)
+
+    for n in args.sizes:
+        candidates = make_candidates(n)
+        index = LocalCandidateIndex()
+        start = time.perf_counter()
+        index.add_candidates(candidates)
+        build = time.perf_counter() - start
+
+        latencies = []
+        sufficient = 0
+        for _ in range(args.queries):
+            query = rng.choice(QUERIES)
+            start = time.perf_counter()
+            hits = index.search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            sufficient += len(hits) >= LOCAL_MIN_RESULTS
+
+        print(f"{n} profiles:")
+        print(f"  build:   {build:.2f}s ({n / build:,.0f} profiles/s), {len(index.index._postings):,} terms")
+        print(f"  query:   p50 {percentile(latencies, 50):.1f} ms, p95 {percentile(latencies, 95):.1f} ms, "
+              f"mean {statistics.mean(latencies):.1f} ms")
+        print(f"  local recall sufficient for {sufficient}/{args.queries} queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Reference copy of the original per-candidate ``_heuristic_score``, kept
+verbatim so benchmarks can compare the current scorer against it.
+"""
+import re
+import random
+
+
+# Unchanged since the original; benchmarks bind the live implementation here
+_build_personalized_reason = None
+
+
+def _heuristic_score(query: str, candidate: dict) -> dict:
+    """
+    Text-based fallback scorer when Gemini is unavailable.
+    Produces varied scores and personalized analysis per candidate.
+    """
+    query_lower = query.lower()
+    title_raw = candidate.get('title') or ''
+    title = title_raw.lower()
+    content_raw = candidate.get('content') or ''
+    content = content_raw.lower()
+    full_text = f"{title} {content}"
+
+    # Extract meaningful keywords from the query (3+ chars, no stopwords)
+    stopwords = {'the', 'and', 'for', 'with', 'who', 'that', 'this', 'are', 'was', 'has',
+                 'not', 'but', 'from', 'they', 'been', 'have', 'its', 'can', 'will',
+                 'just', 'our', 'one', 'all', 'their', 'about', 'into', 'some',
+                 'someone', 'wants', 'interested', 'long', 'term', 'ideas', 'stage',
+                 'looking', 'based', 'out', 'well', 'best', 'cause', 'will', 'also',
+                 'him', 'her', 'his', 'she', 'intern', 'hiring', 'college', 'student',
+                 'need', 'want', 'find', 'good', 'great', 'work', 'job', 'role',
+                 'company', 'team', 'experience', 'year', 'years', 'would', 'like',
+                 'skills', 'skill', 'using', 'used', 'able', 'make', 'working'}
+    query_words = [w for w in re.findall(r'[a-z]+', query_lower) if len(w) >= 3 and w not in stopwords]
+    if not query_words:
+        query_words = re.findall(r'[a-z]+', query_lower)
+
+    # --- Signal 1: Keyword overlap (40% weight) ---
+    if query_words:
+        matches = sum(1 for w in query_words if w in full_text)
+        keyword_score = (matches / len(query_words)) * 100
+    else:
+        keyword_score = 50
+
+    # --- Signal 2: Title relevance (35% weight) ---
+    if query_words:
+        title_matches = sum(1 for w in query_words if w in title)
+        title_score = (title_matches / len(query_words)) * 100
+    else:
+        title_score = 50
+
+    # --- Signal 3: Content richness (25% weight) ---
+    content_len = len(content)
+    if content_len > 1000:
+        richness_score = 90
+    elif content_len > 500:
+        richness_score = 70
+    elif content_len > 200:
+        richness_score = 50
+    elif content_len > 50:
+        richness_score = 35
+    else:
+        richness_score = 20
+
+    # Weighted combination
+    raw_score = (keyword_score * 0.40) + (title_score * 0.35) + (richness_score * 0.25)
+
+    # Add small jitter to avoid ties, clamp to 25-95
+    jitter = random.randint(-3, 3)
+    final_score = max(25, min(95, int(raw_score + jitter)))
+
+    # Map score to confidence level (softer labels)
+    if final_score >= 75:
+        confidence = "Strong Match"
+    elif final_score >= 50:
+        confidence = "Good Match"
+    else:
+        confidence = "Partial Match"
+
+    # --- Extract UNIQUE profile details for personalized analysis ---
+
+    # 1. Extract candidate name from title (usually "FirstName LastName - Title | LinkedIn")
+    name = title_raw.split(' - ')[0].split(' | ')[0].split(' – ')[0].strip()
+    if len(name) > 40 or not name:
+        name = "This candidate"
+
+    # 2. Extract companies/organizations mentioned in content
+    # Blocklist of LinkedIn UI artifacts and false positives
+    company_blocklist = {
+        'people also viewed', 'sign in', 'join now', 'linkedin', 'view profile',
+        'show more', 'see all', 'about', 'experience', 'education', 'skills',
+        'activity', 'interests', 'recommendations', 'connections', 'followers',
+        'posts', 'articles', 'more profiles', 'similar profiles', 'mutual connections',
+        'open to work', 'hiring', 'promoted', 'featured', 'premium',
+        'people you may know', 'add to your feed', 'this person', 'their profile',
+        'covid', 'pandemic', 'lockdown', 'remote work', 'work from home',
+        'the world', 'new york', 'the best', 'the first', 'the most',
+        'i am', 'i have', 'my name', 'hello', 'hi there', 'welcome',
+        'click here', 'learn more', 'read more', 'see more', 'show all',
+        'sumit pandey', 'people', 'based', 'looking', 'available'
+    }
+
+    known_companies = re.findall(
+        r'(?:at|@|with|from|worked at|working at|currently at)\s+([A-Z][A-Za-z0-9&.\' ]{2,25})',
+        content_raw
+    )
+    # Also try to grab capitalized multi-word names that look like companies
+    if not known_companies:
+        known_companies = re.findall(r'\b([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)\b', content_raw)
+    
+    # Filter out LinkedIn UI artifacts and dedupe
+    companies = []
+    for c in known_companies:
+        c_clean = c.strip()
+        if c_clean.lower() not in company_blocklist and c_clean not in companies and len(c_clean) > 2:
+            companies.append(c_clean)
+        if len(companies) >= 3:
+            break
+
+    # 3. Extract specific tech skills / tools / design tools from content
+    # This is the ONLY source of tags — never use raw query words as tags
+    tech_patterns = re.findall(
+        r'\b(Python|Java|JavaScript|TypeScript|React|Angular|Vue|Node\.?js|AWS|Azure|GCP|'
+        r'Docker|Kubernetes|SQL|NoSQL|MongoDB|PostgreSQL|Redis|GraphQL|REST|API|'
+        r'Machine Learning|Deep Learning|AI|NLP|Data Science|TensorFlow|PyTorch|'
+        r'Go|Rust|C\+\+|Swift|Kotlin|Flutter|Django|Flask|Spring|Rails|'
+        r'Figma|Sketch|Adobe XD|Photoshop|Illustrator|InDesign|After Effects|Premiere|'
+        r'UI/?UX|UX|UI|Product Design|Graphic Design|Visual Design|Motion Design|'
+        r'Interaction Design|User Research|Wireframing|Prototyping|Design Systems|'
+        r'Canva|Blender|Cinema 4D|Webflow|Framer|Zeplin|InVision|Miro|'
+        r'Agile|Scrum|DevOps|CI/CD|Git|GitHub|Jira|Confluence|Notion|'
+        r'Blockchain|Crypto|Web3|Solidity|Cloud|Microservices|Full.?stack|Backend|Frontend|'
+        r'SEO|SEM|Google Analytics|Marketing|Content Strategy|Copywriting|'
+        r'Excel|Tableau|Power BI|Salesforce|HubSpot|SAP|ERP|CRM|'
+        r'HTML|CSS|SASS|Tailwind|Bootstrap|WordPress|Shopify|'
+        r'iOS|Android|Mobile|Responsive|Accessibility|WCAG)\b',
+        content_raw, re.IGNORECASE
+    )
+    # Also check the title for role-specific skills
+    title_skills = re.findall(
+        r'\b(UI/?UX|UX|UI|Graphic Design(?:er)?|Product Design(?:er)?|Visual Design(?:er)?|'
+        r'Frontend|Backend|Full.?stack|Data Scien(?:ce|tist)|Machine Learning|DevOps|'
+        r'Software Engineer|Web Developer|Mobile Developer|Designer|Developer)\b',
+        title_raw, re.IGNORECASE
+    )
+    all_found = tech_patterns + title_skills
+    # Normalize and dedupe
+    skill_normalize = {
+        'ui/ux': 'UI/UX', 'ux': 'UX', 'ui': 'UI', 'graphic designer': 'Graphic Design',
+        'product designer': 'Product Design', 'visual designer': 'Visual Design',
+        'software engineer': 'Software Engineering', 'web developer': 'Web Development',
+        'mobile developer': 'Mobile Development', 'designer': 'Design', 'developer': 'Development',
+    }
+    unique_skills = []
+    seen = set()
+    for s in all_found:
+        normalized = skill_normalize.get(s.lower(), s.capitalize())
+        if normalized.lower() not in seen:
+            seen.add(normalized.lower())
+            unique_skills.append(normalized)
+        if len(unique_skills) >= 5:
+            break
+
+    # 4. Extract years of experience if mentioned
+    exp_match = re.findall(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s+)?(?:experience)?', content, re.IGNORECASE)
+    years_exp = max([int(y) for y in exp_match], default=0) if exp_match else 0
+
+    # 5. Skills display — ONLY real skills, never raw query words
+    skills_str = ", ".join(unique_skills) if unique_skills else "General Match"
+
+    # --- Build personalized reason ---
+    reason = _build_personalized_reason(name, companies, unique_skills, years_exp, final_score, query)
+
+    return {
+        "score": final_score / 100.0,
+        "match_percentage": final_score,
+        "confidence_level": confidence,
+        "primary_skills": skills_str,
+        "reason": reason,
+        "skill_match_score": final_score,
+        "experience_relevance": max(25, min(95, int(title_score + jitter))),
+        "public_signal_strength": max(25, min(95, int(richness_score + jitter)))
+    }
+
+
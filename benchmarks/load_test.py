@@ -0,0 +1,128 @@
+"""
+Concurrency load test for /api/analyze.
+
+Replaces the Tavily and Gemini clients with local stand-ins that just wait a
+fixed latency, then fires N concurrent requests at ``analyze_job``. If the
+pipeline blocks the event loop, wall-clock time grows with N (requests are
+serialized); if it doesn't, N requests finish in roughly the time of one.
+
+Usage:
+    python benchmarks/load_test.py --target api --requests 20 --latency 0.5
+    python benchmarks/load_test.py --target server --requests 8
+"""
+import io
+import json
+import time
+import types
+import asyncio
+import argparse
+import contextlib
+
+from common import load_api_module
+
+FAKE_RESULTS = {
+    "results": [
+        {
+            "title": f"Candidate {i} - Senior Python Engineer | LinkedIn",
+            "url": f"https://www.linkedin.com/in/candidate-{i}",
+            "content": "Senior Python engineer with 6 years of experience at Acme Corp. "
+                       "Django, AWS, Docker, PostgreSQL, Kubernetes.",
+        }
+        for i in range(10)
+    ]
+}
+
+
+def _fake_scores() -> str:
+    return json.dumps([
+        {"url": r["url"], "score": 80 - i, "reason": "Strong Python background.",
+         "confidence": "High", "skills": ["Python", "AWS", "Docker"]}
+        for i, r in enumerate(FAKE_RESULTS["results"])
+    ])
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+def _gemini_text(contents: str) -> str:
+    if "JSON list" in contents:
+        return _fake_scores()
+    if "Job Requirements Summary" in contents:
+        return "Senior Python engineer; Django and AWS required."
+    return "## Ranked Candidate Matches\n1. Candidate 0 - 80% - Python, AWS, Docker"
+
+
+def make_async_stubs(latency: float):
+    async def generate_content(model, contents, config=None):
+        await asyncio.sleep(latency)
+        return _Response(_gemini_text(contents))
+
+    async def generate_content_stream(model, contents, config=None):
+        response = await generate_content(model, contents)
+
+        async def chunks():
+            for i in range(0, len(response.text), 200):
+                yield _Response(response.text[i:i + 200])
+        return chunks()
+
+    async def search(**kwargs):
+        await asyncio.sleep(latency)
+        return FAKE_RESULTS
+
+    models = types.SimpleNamespace(generate_content=generate_content, generate_content_stream=generate_content_stream)
+    gemini = types.SimpleNamespace(aio=types.SimpleNamespace(models=models))
+    tavily = types.SimpleNamespace(search=search)
+    return gemini, tavily
+
+
+def load_target(target: str, latency: float):
+    # Both entry points mount the same scout router, so they share analyze_job;
+    # the target only decides which app module is imported around it
+    from scout import warm_state
+    warm_state["gemini_client"], warm_state["tavily_client"] = make_async_stubs(latency)
+    if target == "api":
+        load_api_module()
+    else:
+        import server  # noqa: F401
+    from scout.routes import JobDescriptionRequest, analyze_job
+    return analyze_job, JobDescriptionRequest
+
+
+async def run(target: str, n_requests: int, latency: float, verbose: bool = False) -> None:
+    analyze_job, JobDescriptionRequest = load_target(target, latency)
+    request = JobDescriptionRequest(description="Senior Python engineer with Django and AWS")
+
+    # Silence the pipeline's progress prints unless asked for them
+    log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        start = time.perf_counter()
+        await analyze_job(request)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(analyze_job(request) for _ in range(n_requests)))
+        concurrent = time.perf_counter() - start
+
+    serialized = single * n_requests
+    print(f"target:             {target}")
+    print(f"stub latency:       {latency:.2f}s per upstream call")
+    print(f"single request:     {single:.2f}s")
+    print(f"{n_requests} concurrent:      {concurrent:.2f}s (serialized would be ~{serialized:.2f}s)")
+    print(f"speedup vs serial:  {serialized / concurrent:.1f}x")
+    print(f"candidates/request: {len(json.loads(responses[0].body)['candidates'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["api", "server"], default="api")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--verbose", action="store_true", help="show pipeline log output")
+    args = parser.parse_args()
+    asyncio.run(run(args.target, args.requests, args.latency, args.verbose))
+
+
+if __name__ == "__main__":
+    main()
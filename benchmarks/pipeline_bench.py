@@ -0,0 +1,136 @@
+"""
+Offline end-to-end pipeline benchmark.
+
+Replays recorded Tavily and Gemini responses (benchmarks/fixtures) through
+the stand-ins in replay.py, with injected latency and 429 rate, and drives
+``run_recruitment_agent`` at each candidate count x concurrency level. Also
+times ``_heuristic_score`` over synthetic pools. Reports throughput,
+p50/p95/p99 latency and memory so regressions show up before deploy.
+
+Usage:
+    python benchmarks/pipeline_bench.py
+    python benchmarks/pipeline_bench.py --candidates 10 50 --concurrency 1 8 32 --requests 64
+    python benchmarks/pipeline_bench.py --latency 0.5 --rate-429 0.1 --memory
+"""
+import io
+import time
+import asyncio
+import argparse
+import resource
+import contextlib
+import tracemalloc
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from heuristic_bench import make_candidates, QUERY
+from index_bench import percentile
+from replay import Faults, Replay, FIXTURES_DIR
+
+JOB_DESCRIPTION = ("Senior Python engineer for a fintech startup: Django or FastAPI, AWS, PostgreSQL, "
+                   "Kubernetes a plus. 5+ years building payment or banking backends, comfortable "
+                   "mentoring and owning services end to end in a small team.")
+
+
+def load_agent(replay: Replay):
+    """Install the replay clients and return a coroutine function running one request."""
+    import scout
+    from scout import heuristic, llm
+    scout.warm_state["gemini_client"], scout.warm_state["tavily_client"] = replay.async_clients()
+    # Independent levels: forget throttling and memoized scores from the previous run
+    llm.gemini_limiters.update({m: llm.ModelLimiter(m) for m in llm.GEMINI_MODELS})
+    heuristic.heuristic_memo.clear()
+    return scout.run_recruitment_agent
+
+
+async def run_level(run_agent, n_requests: int, concurrency: int) -> tuple[list[float], float, int]:
+    """Run ``n_requests`` with at most ``concurrency`` in flight; returns latencies, wall time, failures."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await run_agent(JOB_DESCRIPTION)
+                if not result["search_results"]:
+                    failures += 1
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_requests)))
+    return latencies, time.perf_counter() - start, failures
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_pipeline(args) -> None:
+    print(f"pipeline: latency {args.latency}s ±{args.jitter:.0%}, "
+          f"429 rate {args.rate_429:.0%}, {args.requests} requests per level")
+    print(f"  {'cands':>5} {'conc':>4} {'req/s':>7} {'p50':>7} {'p95':>7} {'p99':>7} "
+          f"{'fail':>4} {'gemini':>6} {'429s':>5} {'peak MB':>8} {'rss MB':>7}")
+    for candidates in args.candidates:
+        for concurrency in args.concurrency:
+            replay = Replay(Faults(args.latency, args.jitter, args.rate_429, args.retry_delay),
+                            candidates=candidates, fixtures_dir=args.fixtures)
+            run_agent = load_agent(replay)
+            if args.memory:
+                tracemalloc.start()
+            log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            with log:
+                latencies, wall, failures = asyncio.run(run_level(run_agent, args.requests, concurrency))
+            peak = "-"
+            if args.memory:
+                peak = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f}"
+                tracemalloc.stop()
+            print(f"  {candidates:>5} {concurrency:>4} {len(latencies) / wall:>7.2f} "
+                  f"{percentile(latencies, 50):>6.2f}s {percentile(latencies, 95):>6.2f}s "
+                  f"{percentile(latencies, 99):>6.2f}s {failures:>4} {replay.calls['gemini']:>6} "
+                  f"{replay.calls['gemini_429']:>5} {peak:>8} {max_rss_mb():>7.1f}")
+
+
+def bench_heuristic(sizes: list[int]) -> None:
+    from scout import heuristic
+    print("_heuristic_score:")
+    print(f"  {'cands':>6} {'cand/s':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for n in sizes:
+        pool = make_candidates(n)
+        heuristic.heuristic_memo.clear()
+        latencies = []
+        start = time.perf_counter()
+        for cand in pool:
+            t = time.perf_counter()
+            heuristic._heuristic_score(QUERY, cand)
+            latencies.append((time.perf_counter() - t) * 1e6)
+        wall = time.perf_counter() - start
+        print(f"  {n:>6} {n / wall:>9.0f} {percentile(latencies, 50):>6.0f}us "
+              f"{percentile(latencies, 95):>6.0f}us {percentile(latencies, 99):>6.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=32, help="requests per level")
+    parser.add_argument("--latency", type=float, default=0.3, help="mean injected latency per upstream call")
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency spread, as a fraction of the mean")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of Gemini calls that fail with 429")
+    parser.add_argument("--retry-delay", type=float, default=1.0, help="retryDelay hint on injected 429s")
+    parser.add_argument("--heuristic-sizes", type=int, nargs="*", default=[100, 1000, 10000])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--memory", action="store_true", help="track peak Python allocations (slower)")
+    parser.add_argument("--verbose", action="store_true", help="show pipeline log output")
+    args = parser.parse_args()
+
+    bench_pipeline(args)
+    if args.heuristic_sizes:
+        bench_heuristic(args.heuristic_sizes)
+
+
+if __name__ == "__main__":
+    main()
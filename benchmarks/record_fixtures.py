@@ -0,0 +1,102 @@
+"""
+Record live Tavily and Gemini responses as replay fixtures.
+
+Runs ``run_recruitment_agent`` once per job description against the real
+services (needs TAVILY_API_KEY and GEMINI_API_KEY) and writes every Tavily
+response and Gemini output to benchmarks/fixtures, in the format replay.py
+serves. Existing fixtures are replaced.
+
+Usage:
+    python benchmarks/record_fixtures.py "Senior Python engineer, fintech, Django, AWS"
+"""
+import os
+import json
+import asyncio
+import argparse
+
+from dotenv import load_dotenv
+
+# Load the real keys before common.py fills in dummy ones
+load_dotenv()
+os.environ.setdefault("GEMINI_CACHE_BACKEND", "none")
+os.environ.setdefault("TAVILY_CACHE_BACKEND", "none")
+os.environ.setdefault("LOCAL_FIRST", "0")
+os.environ.setdefault("GEMINI_HEDGE", "0")
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from replay import FIXTURES_DIR, prompt_kind
+
+
+async def record(job_descriptions: list[str], fixtures_dir: str) -> None:
+    import scout
+    from scout.llm import get_gemini_client
+    from scout.search import get_tavily_client
+    if "benchmark" in (os.getenv("GEMINI_API_KEY"), os.getenv("TAVILY_API_KEY")):
+        raise SystemExit("Recording needs real GEMINI_API_KEY and TAVILY_API_KEY values.")
+
+    tavily_recorded = []
+    gemini_recorded = {"keywords": [], "scoring": [], "summary": [], "narrative": []}
+    tavily_client = get_tavily_client()
+    search = tavily_client.search
+    models = get_gemini_client().aio.models
+    generate_content = models.generate_content
+    generate_content_stream = models.generate_content_stream
+
+    async def recording_search(query, **kwargs):
+        response = await search(query=query, **kwargs)
+        tavily_recorded.append({"query": query, "response": response})
+        return response
+
+    async def recording_generate_content(model, contents, config=None):
+        response = await generate_content(model=model, contents=contents, config=config)
+        if response.text:
+            gemini_recorded[prompt_kind(contents)].append(response.text)
+        return response
+
+    async def recording_generate_content_stream(model, contents, config=None):
+        stream = await generate_content_stream(model=model, contents=contents, config=config)
+
+        async def chunks():
+            parts = []
+            async for chunk in stream:
+                parts.append(chunk.text or "")
+                yield chunk
+            if any(parts):
+                gemini_recorded[prompt_kind(contents)].append("".join(parts))
+        return chunks()
+
+    tavily_client.search = recording_search
+    # Scoring streams its structured response; the other steps use generate_content
+    models.generate_content = recording_generate_content
+    models.generate_content_stream = recording_generate_content_stream
+    for description in job_descriptions:
+        result = await scout.run_recruitment_agent(description)
+        print(f"Recorded run: {len(result['search_results'])} candidates")
+
+    missing = [kind for kind, texts in gemini_recorded.items() if not texts and kind != "keywords"]
+    if not tavily_recorded or missing:
+        raise SystemExit(f"Nothing recorded for: {missing or ['tavily']}; fixtures left unchanged.")
+    if not gemini_recorded["keywords"]:
+        # Short descriptions skip condensing; keep the previous keyword fixtures
+        with open(os.path.join(fixtures_dir, "gemini_responses.json")) as f:
+            gemini_recorded["keywords"] = json.load(f)["keywords"]
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    with open(os.path.join(fixtures_dir, "tavily_search.json"), "w") as f:
+        json.dump(tavily_recorded, f, indent=2)
+    with open(os.path.join(fixtures_dir, "gemini_responses.json"), "w") as f:
+        json.dump(gemini_recorded, f, indent=2)
+    print(f"Wrote {len(tavily_recorded)} Tavily and "
+          f"{sum(map(len, gemini_recorded.values()))} Gemini fixtures to {fixtures_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job_descriptions", nargs="+")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args()
+    asyncio.run(record(args.job_descriptions, args.fixtures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Fixture-backed stand-ins for ``tavily_client`` and ``gemini_client``.
+
+Responses come from recorded fixtures (see record_fixtures.py) instead of
+the network. Every call waits an injected latency, and Gemini calls fail
+with a 429 at a configurable rate, so the pipeline's retry, fallback and
+deadline paths run as they would against the real services.
+"""
+import os
+import re
+import json
+import types
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+from google.genai import errors
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_PROMPT_URL_RE = re.compile(r'"url":\s*"([^"]+)"')
+_PACKED_JOBS_RE = re.compile(r'Jobs:\s*(\[.*?\])\s*Candidates:', re.DOTALL)
+
+
+def load_fixtures(fixtures_dir: str = FIXTURES_DIR) -> tuple[list[dict], dict]:
+    with open(os.path.join(fixtures_dir, "tavily_search.json")) as f:
+        tavily = json.load(f)
+    with open(os.path.join(fixtures_dir, "gemini_responses.json")) as f:
+        gemini = json.load(f)
+    return tavily, gemini
+
+
+def prompt_kind(contents: str) -> str:
+    """Which pipeline step a Gemini prompt belongs to."""
+    if "job-related keywords" in contents:
+        return "keywords"
+    if "JSON list" in contents:
+        return "scoring"
+    if 'the "Job Requirements Summary" section' in contents:
+        return "summary"
+    return "narrative"
+
+
+class Faults:
+    """Injected latency (mean seconds, +/- ``jitter`` fraction) and 429 rate."""
+
+    def __init__(self, latency: float = 0.3, jitter: float = 0.5, rate_429: float = 0.0,
+                 retry_delay: float = 1.0, seed: int = 18):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_delay = retry_delay
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_latency(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter)))
+
+    def maybe_throttle(self) -> None:
+        with self._lock:
+            throttled = self._rng.random() < self.rate_429
+        if throttled:
+            raise errors.ClientError(429, {"error": {
+                "code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Resource has been exhausted.",
+                "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                             "retryDelay": f"{self.retry_delay:g}s"}],
+            }})
+
+
+class Replay:
+    """Serves recorded responses, scaled to ``candidates`` Tavily results per search."""
+
+    def __init__(self, faults: Faults, candidates: int = 10, fixtures_dir: str = FIXTURES_DIR):
+        self.faults = faults
+        self.candidates = candidates
+        self.tavily_fixtures, self.gemini_fixtures = load_fixtures(fixtures_dir)
+        self.calls = {"tavily": 0, "gemini": 0, "gemini_429": 0}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _next(self) -> int:
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def tavily_response(self, query: str) -> dict:
+        recorded = next((f for f in self.tavily_fixtures if f["query"] == query), None)
+        recorded = recorded or self.tavily_fixtures[self._next() % len(self.tavily_fixtures)]
+        pool = recorded["response"]["results"]
+        results = []
+        for i in range(self.candidates):
+            result = dict(pool[i % len(pool)])
+            if i >= len(pool):
+                # Repeat the recorded profiles under distinct URLs to reach the requested pool size
+                url = urlparse(result["url"])
+                result["url"] = url._replace(path=f"{url.path.rstrip('/')}-{i // len(pool)}").geturl()
+            results.append(result)
+        return {**recorded["response"], "results": results}
+
+    def gemini_text(self, contents: str) -> str:
+        kind = prompt_kind(contents)
+        recorded = self.gemini_fixtures[kind]
+        text = recorded[self._next() % len(recorded)]
+        if kind != "scoring":
+            return text
+        # Re-key the recorded scores onto the candidates actually in the prompt
+        scores = json.loads(text.replace("```json", "").replace("```", "").strip())
+        packed = _PACKED_JOBS_RE.search(contents)
+        if packed:
+            pairs = [(job["job"], url) for job in json.loads(packed.group(1)) for url in job["candidates"]]
+            return json.dumps([{**scores[i % len(scores)], "job": job, "url": url}
+                               for i, (job, url) in enumerate(pairs)])
+        urls = _PROMPT_URL_RE.findall(contents)
+        return json.dumps([{**scores[i % len(scores)], "url": url} for i, url in enumerate(urls)])
+
+    def _gemini_call(self, contents: str):
+        with self._lock:
+            self.calls["gemini"] += 1
+        try:
+            self.faults.maybe_throttle()
+        except errors.ClientError:
+            with self._lock:
+                self.calls["gemini_429"] += 1
+            raise
+        return types.SimpleNamespace(text=self.gemini_text(contents))
+
+    def async_clients(self):
+        """(gemini_client, tavily_client) stand-ins for the scout agent."""
+        async def generate_content(model, contents, config=None):
+            await asyncio.sleep(self.faults.sample_latency())
+            return self._gemini_call(contents)
+
+        async def generate_content_stream(model, contents, config=None):
+            response = await generate_content(model, contents)
+
+            async def chunks():
+                for i in range(0, len(response.text), 200):
+                    yield types.SimpleNamespace(text=response.text[i:i + 200])
+            return chunks()
+
+        async def search(query, **kwargs):
+            await asyncio.sleep(self.faults.sample_latency())
+            with self._lock:
+                self.calls["tavily"] += 1
+            return self.tavily_response(query)
+
+        models = types.SimpleNamespace(generate_content=generate_content,
+                                       generate_content_stream=generate_content_stream)
+        return types.SimpleNamespace(aio=types.SimpleNamespace(models=models)), types.SimpleNamespace(search=search)
@@ -0,0 +1,66 @@
+"""
+Semantic pre-rank benchmark.
+
+Embeds synthetic profile pools with the configured embedding backend, stores
+them in a memory-mapped VectorStore and reports embedding throughput, top-k
+query latency (p50/p95) over the whole matrix, and how long the pre-rank
+step in ``score_candidates`` takes for a single request's pool.
+
+Usage:
+    python benchmarks/semantic_bench.py --sizes 10000 100000 --queries 200
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from heuristic_bench import make_candidates
+from index_bench import QUERIES, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pool", type=int, default=50, help="candidates per request for the pre-rank timing")
+    args = parser.parse_args()
+
+    from scout import semantic
+    embedder = semantic.get_embedder()
+    rng = random.Random(13)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            candidates = make_candidates(n)
+            store = semantic.VectorStore(embedder.dim, os.path.join(tmp, f"bench-{n}"), max_rows=n)
+            start = time.perf_counter()
+            for i in range(0, n, 1000):
+                chunk = candidates[i:i + 1000]
+                vectors = embedder.embed([f"{c.title} {c.content}" for c in chunk])
+                store.add([c.url for c in chunk], vectors)
+            build = time.perf_counter() - start
+
+            latencies = []
+            for _ in range(args.queries):
+                query = embedder.embed([rng.choice(QUERIES)])
+                start = time.perf_counter()
+                store.top_k(query, 10)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            print(f"{n} profiles ({embedder.name}, dim {embedder.dim}):")
+            print(f"  embed+store: {build:.2f}s ({n / build:,.0f} profiles/s)")
+            print(f"  top-10:      p50 {percentile(latencies, 50):.1f} ms, p95 {percentile(latencies, 95):.1f} ms, "
+                  f"mean {statistics.mean(latencies):.1f} ms")
+
+        pool = make_candidates(args.pool, seed=99)
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            shortlist, _ = semantic.semantic_prerank(QUERIES[0], pool, semantic.SEMANTIC_TOP_K)
+            print(f"pre-rank {args.pool} -> {len(shortlist)} ({label}): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Candidate representation benchmark.
+
+Takes a synthetic pool of scored candidates from search result to response
+body two ways and reports time and allocations per request:
+
+  * legacy: a dict per search result, a second dict per scored result,
+    a Pydantic Candidate per response item (numbers as str), then
+    jsonable_encoder + json.dumps, as the API did before CandidateRecord.
+  * record: one CandidateRecord per search result, scored in place and
+    written once by scout.candidate.dumps (orjson).
+
+Usage:
+    python benchmarks/serialize_bench.py
+    python benchmarks/serialize_bench.py --sizes 100 1000 10000 --repeat 5
+"""
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from heuristic_bench import make_candidates
+
+SCORES = {"score": 0.82, "match_percentage": 82, "primary_skills": "Python, React, AWS",
+          "confidence_level": "Strong Match", "reason": "Eight years of Python at a fintech.",
+          "skill_match_score": 82, "experience_relevance": 74, "public_signal_strength": 65}
+
+
+def legacy_body(raw: list[dict]) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import BaseModel
+
+    class Candidate(BaseModel):
+        title: str
+        url: str = None
+        skills: str = None
+        confidence: str = None
+        skill_score: str = None
+        exp_relevance: str = None
+        signal_strength: str = None
+        match_percentage: str = None
+        reason: str = None
+        image: str = None
+
+    candidates = [{"title": r["title"], "url": r["url"], "content": r["content"], "image": None} for r in raw]
+    results = [{"title": c["title"], "url": c["url"], "content": c["content"], **SCORES, "match_type": "heuristic",
+                "image": c.get("image")} for c in candidates]
+    models = [Candidate(
+        title=res.get('title', 'Unknown Candidate'), url=res.get('url', ''), skills=res.get('primary_skills', ''),
+        confidence=res.get('confidence_level', 'Medium'), skill_score=str(res.get('skill_match_score', '0')),
+        exp_relevance=str(res.get('experience_relevance', '0')),
+        signal_strength=str(res.get('public_signal_strength', '0')),
+        match_percentage=str(res.get('match_percentage', 0)), reason=res.get('reason', 'Analysis pending'),
+        image=res.get('image') or '') for res in results]
+    body = {"analysis_report": "report", "candidates": models, "stdout_log": "Analysis complete."}
+    return json.dumps(jsonable_encoder(body)).encode()
+
+
+def record_body(raw: list[dict]) -> bytes:
+    from scout.candidate import CandidateRecord, dumps
+    records = [CandidateRecord(url=r["url"], title=r["title"], content=r["content"]) for r in raw]
+    for rec in records:
+        rec.match_percentage = rec.skill_match_score = SCORES["skill_match_score"]
+        rec.experience_relevance = SCORES["experience_relevance"]
+        rec.public_signal_strength = SCORES["public_signal_strength"]
+        rec.primary_skills = SCORES["primary_skills"]
+        rec.confidence_level = SCORES["confidence_level"]
+        rec.reason = SCORES["reason"]
+        rec.match_type = "heuristic_analysis"
+    return dumps({"analysis_report": "report", "candidates": records, "stdout_log": "Analysis complete."})
+
+
+def measure(fn, raw: list[dict], repeat: int) -> tuple[float, float, int]:
+    """Median ms, peak traced MB and bytes of output for ``fn(raw)``."""
+    fn(raw)  # warm up imports and class creation
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(raw)
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(raw)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return statistics.median(times), peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"  {'cands':>6} {'path':<7} {'median':>9} {'peak MB':>8} {'body KB':>8}")
+    for n in args.sizes:
+        raw = [{"title": c.title, "url": c.url, "content": c.content} for c in make_candidates(n)]
+        for label, fn in (("legacy", legacy_body), ("record", record_body)):
+            ms, peak, size = measure(fn, raw, args.repeat)
+            print(f"  {n:>6} {label:<7} {ms:>7.1f}ms {peak:>8.1f} {size / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -110,7 +110,7 @@ const CandidateCard = ({ candidate, rank }) => {
                         <CheckCircle size={14} />
                         {candidate.confidence}
                     </span>
-                    <span>{candidate.match_percentage}% Match</span>
+                    <span>{candidate.match_percentage != null ? `${candidate.match_percentage}% Match` : 'Scoring...'}</span>
                 </div>
 
                 <a
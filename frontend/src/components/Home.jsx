@@ -21,6 +21,52 @@ function Home() {
     else mainSectionRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
 
+  // Reads NDJSON events from /api/analyze/stream so candidates render before
+  // scoring and the report finish. Returns false if the endpoint is missing.
+  const streamAnalysis = async () => {
+    const response = await fetch('/api/analyze/stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ description: jobDescription })
+    });
+    if (response.status === 404 || response.status === 405) return false;
+    if (!response.ok || !response.body) throw new Error(`Stream failed: ${response.status}`);
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    const handleEvent = ({ event, data }) => {
+      if (event === 'candidates' || event === 'scores') {
+        setData((prev) => ({ ...(prev || { analysis_report: '' }), candidates: data }));
+      } else if (event === 'score') {
+        // One candidate scored; fill in its card in place until the ranked list arrives
+        setData((prev) => {
+          const candidates = prev?.candidates || [];
+          const scored = candidates.some((c) => c.url === data.url)
+            ? candidates.map((c) => (c.url === data.url ? { ...c, ...data } : c))
+            : [...candidates, data];
+          return { ...(prev || { analysis_report: '' }), candidates: scored };
+        });
+      } else if (event === 'report') {
+        setData((prev) => ({ ...(prev || { candidates: [] }), analysis_report: (prev?.analysis_report || '') + data }));
+      } else if (event === 'error') {
+        throw new Error(data);
+      }
+    };
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.filter((line) => line.trim()).forEach((line) => handleEvent(JSON.parse(line)));
+    }
+    if (buffer.trim()) handleEvent(JSON.parse(buffer));
+    return true;
+  };
+
   const handleSearch = async () => {
     if (!jobDescription.trim()) return;
 
@@ -29,10 +75,14 @@ function Home() {
     setData(null);
 
     try {
-      const response = await axios.post('/api/analyze', {
-        description: jobDescription
-      });
-      setData(response.data);
+      const streamed = await streamAnalysis();
+      if (!streamed) {
+        // Backend without the streaming endpoint — fall back to a single response
+        const response = await axios.post('/api/analyze', {
+          description: jobDescription
+        });
+        setData(response.data);
+      }
     } catch (err) {
       console.error(err);
       setError('Failed to fetch analysis. Ensure the backend is running.');
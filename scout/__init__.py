@@ -0,0 +1,36 @@
+"""
+Scout's recruitment agent: search, scoring and report generation for a job
+description, shared by the FastAPI app in api/analyze.py and server.py.
+
+Backends are picked by environment variable, each from a registry that new
+implementations register in:
+
+  * LLM_BACKEND      -> scout.llm.LLM_BACKENDS        (default "gemini")
+  * SEARCH_BACKEND   -> scout.search.SEARCH_BACKENDS  (default "tavily")
+  * SCORING_BACKEND  -> scout.scoring.SCORING_BACKENDS ("llm" or "heuristic")
+  * GEMINI_CACHE_BACKEND / TAVILY_CACHE_BACKEND -> scout.cache.CACHE_BACKENDS
+"""
+
+from dotenv import load_dotenv
+
+# Load environment variables before the submodules read their config
+load_dotenv()
+
+from .batch import BATCH_MAX_JOBS, run_batch_analysis  # noqa: E402
+from .candidate import CandidateRecord  # noqa: E402
+from .deadline import REQUEST_DEADLINE, start_deadline  # noqa: E402
+from .llm import start_hedge_budget  # noqa: E402
+from .metrics import STDOUT_LOG_SPANS, metrics, span, start_trace  # noqa: E402
+from .pipeline import collect_runtime_metrics, run_recruitment_agent, search_job_candidates  # noqa: E402
+from .profiles import analyze_candidate_profile, analyze_candidate_profiles  # noqa: E402
+from .report import stream_analysis_report, summarize_requirements  # noqa: E402
+from .scoring import score_candidates  # noqa: E402
+from .search import TAVILY_MAX_RESULTS, TAVILY_RESULTS_LIMIT, fetch_candidates  # noqa: E402
+from .warm import warm_state  # noqa: E402
+
+__all__ = [
+    "BATCH_MAX_JOBS", "CandidateRecord", "REQUEST_DEADLINE", "STDOUT_LOG_SPANS", "TAVILY_MAX_RESULTS", "TAVILY_RESULTS_LIMIT",
+    "analyze_candidate_profile", "analyze_candidate_profiles", "collect_runtime_metrics", "fetch_candidates", "metrics", "run_batch_analysis", "run_recruitment_agent",
+    "score_candidates", "search_job_candidates", "span", "start_deadline", "start_hedge_budget", "start_trace",
+    "stream_analysis_report", "summarize_requirements", "warm_state",
+]
@@ -0,0 +1,192 @@
+"""Analysis of many job descriptions at once, sharing searches and scoring calls."""
+
+import os
+import json
+import time
+import asyncio
+
+from .candidate import CandidateRecord
+from .deadline import run_within_budget, start_deadline
+from .heuristic import HeuristicScorer
+from .llm import call_llm_items, start_hedge_budget
+from .metrics import metrics, span, start_trace
+from .prompts import SCORING_PROMPT_FIELDS, compact_candidates_json
+from .report import assemble_report, generate_ranking_narrative, summarize_requirements
+from .scoring import (SCORE_ITEM_PROPERTIES, SCORING_BACKEND, SCORING_CONCURRENCY, ranked_results,
+                      record_candidates, score_candidates, score_list_schema, split_for_scoring)
+from .search import condense_query, fetch_candidates
+
+
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "25"))
+# Limits for one packed scoring prompt covering several jobs
+BATCH_PACK_MAX_CANDIDATES = int(os.getenv("BATCH_PACK_MAX_CANDIDATES", "15"))
+BATCH_PACK_MAX_PAIRS = int(os.getenv("BATCH_PACK_MAX_PAIRS", "40"))
+PACKED_SCORING_SCHEMA = score_list_schema({"job": {"type": "STRING"}, **SCORE_ITEM_PROPERTIES})
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _build_packed_scoring_prompt(jobs: list[tuple], candidates: list[CandidateRecord]) -> str:
+    """
+    Build one Gemini prompt scoring candidates against several jobs.
+    ``jobs`` holds (job id, query, candidate URLs to score for it); each
+    candidate profile appears once however many jobs it is scored for.
+    """
+    job_list = json.dumps([{"job": job_id, "query": query, "candidates": urls} for job_id, query, urls in jobs],
+                          separators=(",", ":"), ensure_ascii=False)
+    return f"""
+    You are an expert recruiter. I will provide several job queries and a pool of candidates found.
+    For each job, evaluate how well each candidate listed under it matches that job's query.
+    
+    Jobs:
+    {job_list}
+    
+    Candidates:
+    {compact_candidates_json(candidates, SCORING_PROMPT_FIELDS, "Packed scoring")}
+    
+    For each (job, candidate) pair, provide:
+    1. A match score (0-100)
+    2. A brief 1-sentence reason.
+    3. A confidence level (High, Medium, Low).
+    4. Top 3 matched skills found in snippet.
+    
+    Return a JSON list of objects with keys: "job", "url", "score", "reason", "confidence", "skills".
+    Return ONLY valid JSON, no markdown code blocks.
+    """
+
+
+def _pack_scoring_work(work: list[tuple]) -> list[tuple[list[tuple], list[CandidateRecord]]]:
+    """
+    Greedily pack (job id, query, shortlist) entries into prompts holding at
+    most BATCH_PACK_MAX_CANDIDATES distinct profiles and BATCH_PACK_MAX_PAIRS
+    (job, candidate) pairs. Jobs that share candidates pack tightly.
+    """
+    packs = []
+    jobs, candidates, pairs = [], {}, 0
+    for job_id, query, shortlist in work:
+        for i in range(0, len(shortlist), BATCH_PACK_MAX_CANDIDATES):
+            chunk = shortlist[i:i + BATCH_PACK_MAX_CANDIDATES]
+            new = {c.url for c in chunk} - candidates.keys()
+            if jobs and (len(candidates) + len(new) > BATCH_PACK_MAX_CANDIDATES
+                         or pairs + len(chunk) > BATCH_PACK_MAX_PAIRS):
+                packs.append((jobs, list(candidates.values())))
+                jobs, candidates, pairs = [], {}, 0
+            jobs.append((job_id, query, [c.url for c in chunk]))
+            for cand in chunk:
+                candidates.setdefault(cand.url, cand)
+            pairs += len(chunk)
+    if jobs:
+        packs.append((jobs, list(candidates.values())))
+    return packs
+
+
+async def _score_pack(jobs: list[tuple], candidates: list[CandidateRecord], semaphore: asyncio.Semaphore) -> dict:
+    """
+    Score one packed prompt. Returns Gemini's score info keyed by (job id,
+    url); pairs scored before a failure or timeout are kept.
+    """
+    wanted = {(job_id, url) for job_id, _, urls in jobs for url in urls}
+    scored = {}
+
+    async def call():
+        async with semaphore:
+            async for item in call_llm_items(_build_packed_scoring_prompt(jobs, candidates), PACKED_SCORING_SCHEMA):
+                key = (str(item.get('job')), item.get('url'))
+                if key in wanted:
+                    scored[key] = item
+
+    try:
+        await run_within_budget("score", call())
+    except Exception as e:
+        print(f"Packed scoring stopped for {len(jobs)} job(s) after {len(scored)} pair(s) ({e}), "
+              f"using heuristic fallback for the rest...")
+    return scored
+
+
+async def run_batch_analysis(job_descriptions: list[str]):
+    """
+    Analyze several job descriptions together, yielding ``(index, result)``
+    as each job finishes; ``result`` is shaped like run_recruitment_agent's.
+
+    Identical descriptions are analyzed once. Descriptions that condense to
+    the same search query share one Tavily search. Profile features are
+    extracted once for the whole batch. With the "llm" scoring backend,
+    scoring for several jobs is packed into shared Gemini prompts; other
+    backends score each job on its own. The batch shares one request deadline.
+    """
+    start_hedge_budget()
+    start_deadline()
+    trace = start_trace()
+
+    indices = {}  # normalized description -> request positions
+    for i, description in enumerate(job_descriptions):
+        indices.setdefault(_normalize_text(description), []).append(i)
+    jobs = {key: job_descriptions[positions[0]] for key, positions in indices.items()}
+    job_ids = {key: f"J{n}" for n, key in enumerate(jobs, 1)}
+    print(f"Batch: {len(job_descriptions)} job(s), {len(jobs)} unique")
+
+    # Summaries only need the description; start them alongside search
+    summary_tasks = {key: asyncio.ensure_future(summarize_requirements(desc)) for key, desc in jobs.items()}
+    finish_tasks = []
+    try:
+        condensed = await asyncio.gather(*(condense_query(desc) for desc in jobs.values()))
+        search_keys = {key: _normalize_text(query) for key, query in zip(jobs, condensed)}
+        searches = {}
+        for (key, desc), query in zip(jobs.items(), condensed):
+            if search_keys[key] not in searches:
+                searches[search_keys[key]] = fetch_candidates(desc, query)
+        found = await asyncio.gather(*searches.values(), return_exceptions=True)
+        pools = {}
+        for search_key, result in zip(searches, found):
+            if isinstance(result, BaseException):
+                print(f"Batch search failed ({result}), those jobs get no candidates...")
+                result = []
+            pools[search_key] = result
+
+        unique = {c.url: c for pool in pools.values() for c in pool}
+        print(f"Batch: {len(searches)} unique search(es), {len(unique)} unique profiles")
+        features_by_url = await asyncio.to_thread(record_candidates, list(unique.values()))
+
+        packed = SCORING_BACKEND == "llm"
+        # Jobs sharing a search get their own records, since scores are written into them
+        job_pools = {key: [c.copy() for c in pools[search_keys[key]]] for key in jobs}
+        split_keys = [key for key in jobs if packed]
+        splits = dict(zip(split_keys, await asyncio.gather(
+            *(asyncio.to_thread(split_for_scoring, jobs[key], job_pools[key]) for key in split_keys))))
+        packs = _pack_scoring_work([(job_ids[key], jobs[key], shortlist)
+                                    for key, (shortlist, _) in splits.items() if shortlist])
+        semaphore = asyncio.Semaphore(SCORING_CONCURRENCY)
+        scored = {}
+        with span("batch_score", jobs=len(jobs), packs=len(packs)):
+            for pack_scores in await asyncio.gather(*(_score_pack(j, c, semaphore) for j, c in packs)):
+                scored.update(pack_scores)
+        if packed:
+            print(f"Batch scoring: {sum(len(s) for s, _ in splits.values())} (job, candidate) pairs "
+                  f"in {len(packs)} Gemini call(s)")
+
+        async def finish(key):
+            if packed:
+                shortlist, remainder = splits[key]
+                job_scores = {url: item for (job_id, url), item in scored.items() if job_id == job_ids[key]}
+                search_results = ranked_results(shortlist, remainder, job_scores,
+                                                HeuristicScorer(jobs[key]), features_by_url)
+            else:
+                search_results = await score_candidates(jobs[key], job_pools[key])
+            if search_results:
+                narrative = await generate_ranking_narrative(jobs[key], search_results)
+                analysis_report = assemble_report(await summary_tasks[key], narrative)
+            else:
+                analysis_report = "No matching candidates were found for this job description."
+            return key, {"search_results": search_results, "analysis_report": analysis_report, "trace": trace}
+
+        finish_tasks = [asyncio.ensure_future(finish(key)) for key in jobs]
+        for next_done in asyncio.as_completed(finish_tasks):
+            key, result = await next_done
+            for index in indices[key]:
+                yield index, result
+    finally:
+        for task in [*summary_tasks.values(), *finish_tasks]:
+            task.cancel()
+        metrics.observe("scout_batch_duration_seconds", time.perf_counter() - trace.started)
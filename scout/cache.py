@@ -0,0 +1,167 @@
+"""Response caches (in-memory LRU or SQLite) and single-flight call coalescing."""
+
+import json
+import time
+import asyncio
+import sqlite3
+from collections import OrderedDict
+
+
+class BaseCache:
+    """Common interface for the response caches: get/set plus hit/miss counters."""
+
+    backend = "base"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        return self.get_first([key])
+
+    def get_first(self, keys: list[str]):
+        """Return the value for the first key present, counting one hit or miss."""
+        for key in keys:
+            value = self._load(key)
+            if value is not None:
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "hits": self.hits, "misses": self.misses, "size": self._size()}
+
+    def set(self, key: str, value) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def _load(self, key: str):
+        raise NotImplementedError
+
+    def _size(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache with per-entry TTL."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        super().__init__(max_entries, ttl)
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+    def set(self, key: str, value) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _load(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """On-disk cache backed by SQLite, so entries survive restarts.
+
+    Values are stored as JSON. Least-recently-used rows are evicted once
+    ``max_entries`` is exceeded.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl: float = 86400):
+        super().__init__(max_entries, ttl)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def set(self, key: str, value) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + self.ttl, now)
+        )
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM cache")
+        self._conn.commit()
+
+    def _load(self, key: str):
+        now = time.time()
+        row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE cache SET used_at = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return json.loads(row[0])
+
+    def _size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+# Registered cache backends, built from (ttl, max_entries, path)
+CACHE_BACKENDS = {
+    MemoryCache.backend: lambda ttl, max_entries, path: MemoryCache(max_entries=max_entries, ttl=ttl),
+    SQLiteCache.backend: lambda ttl, max_entries, path: SQLiteCache(
+        path or "/tmp/scout_cache.sqlite3", max_entries=max_entries, ttl=ttl),
+}
+
+
+def make_cache(backend: str, ttl: float, max_entries: int, path: str = None):
+    """Build a cache from config. ``backend`` names one of CACHE_BACKENDS, or "none"."""
+    backend = (backend or "memory").lower()
+    if backend == "none":
+        return None
+    factory = CACHE_BACKENDS.get(backend)
+    if factory is None:
+        print(f"WARNING: unknown cache backend {backend!r}, using memory.")
+        factory = CACHE_BACKENDS[MemoryCache.backend]
+    return factory(ttl, max_entries, path)
+
+
+# In-flight upstream calls, so concurrent identical requests share one call
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def single_flight(key: str, make_call):
+    """Run ``make_call()`` once per key; concurrent callers await the same task."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(make_call())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield() so one caller disconnecting doesn't cancel the call for the others
+    return await asyncio.shield(task)
@@ -0,0 +1,64 @@
+"""The candidate record carried from search through scoring to the response."""
+
+from dataclasses import dataclass
+
+import orjson
+
+
+@dataclass(slots=True)
+class CandidateRecord:
+    """
+    One candidate profile. Search creates it, scoring fills in the score
+    fields in place, and the response is serialized straight from it, so a
+    candidate is never rebuilt as a new dict or model along the way. Score
+    fields are 0-100 ints, None until the candidate is scored.
+    """
+
+    url: str
+    title: str = ""
+    content: str = ""
+    image: str | None = None
+    match_percentage: int | None = None
+    skill_match_score: int | None = None
+    experience_relevance: int | None = None
+    public_signal_strength: int | None = None
+    confidence_level: str | None = None
+    primary_skills: str | None = None
+    reason: str | None = None
+    match_type: str | None = None  # "candidate_profile" (LLM) or "heuristic_analysis"
+
+    @property
+    def score(self) -> float:
+        """Match as a 0-1 fraction, for ranking."""
+        return (self.match_percentage or 0) / 100.0
+
+    def copy(self) -> "CandidateRecord":
+        """A separate record for the same profile, to score it against another job."""
+        return CandidateRecord(self.url, self.title, self.content, self.image)
+
+
+def candidate_response(record: CandidateRecord) -> dict:
+    """The API's Candidate shape for a record."""
+    return {
+        "title": record.title,
+        "url": record.url,
+        "skills": record.primary_skills,
+        "confidence": record.confidence_level,
+        "skill_score": record.skill_match_score,
+        "exp_relevance": record.experience_relevance,
+        "signal_strength": record.public_signal_strength,
+        "match_percentage": record.match_percentage,
+        "reason": record.reason,
+        "image": record.image or "",
+    }
+
+
+def _encode_default(value):
+    if isinstance(value, CandidateRecord):
+        return candidate_response(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    """Serialize a response body in one pass, writing records in the Candidate shape."""
+    return orjson.dumps(content, default=_encode_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
@@ -0,0 +1,69 @@
+"""Per-request deadline that stages budget themselves against."""
+
+import os
+import time
+import asyncio
+import contextvars
+
+
+# vercel.json kills api/analyze.py after maxDuration (60s). Each request runs
+# against a REQUEST_DEADLINE budget (leaving headroom for cold start and the
+# response); every stage gets what is left after keeping its DEADLINE_RESERVE
+# share of the deadline for the stages after it, and takes its cheap path
+# instead when that is under DEADLINE_MIN_STAGE of the deadline or runs out.
+# Both are fractions of the whole deadline, so a short one (say 10s on a
+# Vercel Hobby plan) shrinks every stage instead of skipping the later ones.
+# At the default 50s they come to 35/15/6/1s reserved and a 1.5s minimum.
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "50"))
+DEADLINE_RESERVE = {"condense": 0.7, "search": 0.3, "score": 0.12, "report": 0.02}
+DEADLINE_MIN_STAGE = 0.03
+
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.total = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+def start_deadline(seconds: float = REQUEST_DEADLINE) -> Deadline:
+    """Start the current request's (and its tasks') deadline."""
+    deadline = Deadline(seconds)
+    _deadline.set(deadline)
+    return deadline
+
+
+def deadline_remaining():
+    """Seconds left for the current request, or None outside a request."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def stage_budget(stage: str):
+    """Seconds ``stage`` may spend, or None when there is no deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline.remaining() - DEADLINE_RESERVE[stage] * deadline.total
+
+
+async def run_within_budget(stage: str, coro):
+    """
+    Await ``coro`` within ``stage``'s share of the request deadline. Raises
+    asyncio.TimeoutError if the share is too small to start or runs out, so
+    callers can fall back the same way they do for upstream failures.
+    """
+    budget = stage_budget(stage)
+    if budget is None:
+        return await coro
+    if budget < DEADLINE_MIN_STAGE * _deadline.get().total:
+        coro.close()
+        raise asyncio.TimeoutError(f"skipped {stage}, {max(budget, 0):.1f}s of its budget left")
+    try:
+        return await asyncio.wait_for(coro, budget)
+    except asyncio.TimeoutError:
+        raise asyncio.TimeoutError(f"{stage} ran out of its {budget:.1f}s budget") from None
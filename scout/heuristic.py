@@ -0,0 +1,395 @@
+"""Keyword and skill heuristics used to score candidates without an LLM call."""
+
+import os
+import re
+import random
+import hashlib
+
+from .cache import MemoryCache
+from .candidate import CandidateRecord
+
+
+# Query words that carry no signal about the role
+HEURISTIC_STOPWORDS = frozenset({
+    'the', 'and', 'for', 'with', 'who', 'that', 'this', 'are', 'was', 'has',
+    'not', 'but', 'from', 'they', 'been', 'have', 'its', 'can', 'will',
+    'just', 'our', 'one', 'all', 'their', 'about', 'into', 'some',
+    'someone', 'wants', 'interested', 'long', 'term', 'ideas', 'stage',
+    'looking', 'based', 'out', 'well', 'best', 'cause', 'also',
+    'him', 'her', 'his', 'she', 'intern', 'hiring', 'college', 'student',
+    'need', 'want', 'find', 'good', 'great', 'work', 'job', 'role',
+    'company', 'team', 'experience', 'year', 'years', 'would', 'like',
+    'skills', 'skill', 'using', 'used', 'able', 'make', 'working'
+})
+
+# LinkedIn page chrome that leaks into scraped profile text
+LINKEDIN_UI_TERMS = frozenset({
+    'people also viewed', 'sign in', 'join now', 'view profile',
+    'show more', 'see all', 'more profiles', 'similar profiles', 'mutual connections',
+    'people you may know', 'add to your feed',
+    'click here', 'learn more', 'read more', 'see more', 'show all',
+})
+
+# LinkedIn UI artifacts and false positives that look like company names
+COMPANY_BLOCKLIST = LINKEDIN_UI_TERMS | frozenset({
+    'linkedin', 'about', 'experience', 'education', 'skills',
+    'activity', 'interests', 'recommendations', 'connections', 'followers',
+    'posts', 'articles',
+    'open to work', 'hiring', 'promoted', 'featured', 'premium',
+    'this person', 'their profile',
+    'covid', 'pandemic', 'lockdown', 'remote work', 'work from home',
+    'the world', 'new york', 'the best', 'the first', 'the most',
+    'i am', 'i have', 'my name', 'hello', 'hi there', 'welcome',
+    'sumit pandey', 'people', 'based', 'looking', 'available'
+})
+
+# Skills recognised in profile content. Entries are (display name, spelling
+# variants); variants are matched as whole-token sequences, case-insensitively.
+TECH_SKILLS = [
+    ("Python", []), ("Java", []), ("JavaScript", []), ("TypeScript", []),
+    ("React", []), ("Angular", []), ("Vue", []), ("Node.js", ["nodejs", "node js"]),
+    ("AWS", []), ("Azure", []), ("GCP", []), ("Docker", []), ("Kubernetes", []),
+    ("SQL", []), ("NoSQL", []), ("MongoDB", []), ("PostgreSQL", []), ("Redis", []),
+    ("GraphQL", []), ("REST", []), ("API", []),
+    ("Machine Learning", []), ("Deep Learning", []), ("AI", []), ("NLP", []),
+    ("Data Science", []), ("TensorFlow", []), ("PyTorch", []),
+    ("Go", []), ("Rust", []), ("C++", []), ("Swift", []), ("Kotlin", []),
+    ("Flutter", []), ("Django", []), ("Flask", []), ("Spring", []), ("Rails", []),
+    ("Figma", []), ("Sketch", []), ("Adobe XD", []), ("Photoshop", []),
+    ("Illustrator", []), ("InDesign", []), ("After Effects", []), ("Premiere", []),
+    ("UI/UX", ["uiux"]), ("UX", []), ("UI", []),
+    ("Product Design", []), ("Graphic Design", []), ("Visual Design", []),
+    ("Motion Design", []), ("Interaction Design", []), ("User Research", []),
+    ("Wireframing", []), ("Prototyping", []), ("Design Systems", []),
+    ("Canva", []), ("Blender", []), ("Cinema 4D", []), ("Webflow", []),
+    ("Framer", []), ("Zeplin", []), ("InVision", []), ("Miro", []),
+    ("Agile", []), ("Scrum", []), ("DevOps", []), ("CI/CD", []), ("Git", []),
+    ("GitHub", []), ("Jira", []), ("Confluence", []), ("Notion", []),
+    ("Blockchain", []), ("Crypto", []), ("Web3", []), ("Solidity", []),
+    ("Cloud", []), ("Microservices", []), ("Full-stack", ["fullstack", "full stack"]),
+    ("Backend", []), ("Frontend", []),
+    ("SEO", []), ("SEM", []), ("Google Analytics", []), ("Marketing", []),
+    ("Content Strategy", []), ("Copywriting", []),
+    ("Excel", []), ("Tableau", []), ("Power BI", []), ("Salesforce", []),
+    ("HubSpot", []), ("SAP", []), ("ERP", []), ("CRM", []),
+    ("HTML", []), ("CSS", []), ("SASS", []), ("Tailwind", []), ("Bootstrap", []),
+    ("WordPress", []), ("Shopify", []),
+    ("iOS", []), ("Android", []), ("Mobile", []), ("Responsive", []),
+    ("Accessibility", []), ("WCAG", []),
+]
+
+# Role-specific skills recognised in the profile title
+TITLE_SKILLS = [
+    ("UI/UX", ["uiux"]), ("UX", []), ("UI", []),
+    ("Graphic Designer", ["graphic design"]), ("Product Designer", ["product design"]),
+    ("Visual Designer", ["visual design"]),
+    ("Frontend", []), ("Backend", []), ("Full-stack", ["fullstack", "full stack"]),
+    ("Data Science", ["data scientist"]), ("Machine Learning", []), ("DevOps", []),
+    ("Software Engineer", []), ("Web Developer", []), ("Mobile Developer", []),
+    ("Designer", []), ("Developer", []),
+]
+
+SKILL_NORMALIZE = {
+    'ui/ux': 'UI/UX', 'ux': 'UX', 'ui': 'UI', 'graphic designer': 'Graphic Design',
+    'product designer': 'Product Design', 'visual designer': 'Visual Design',
+    'software engineer': 'Software Engineering', 'web developer': 'Web Development',
+    'mobile developer': 'Mobile Development', 'designer': 'Design', 'developer': 'Development',
+}
+
+# Tokens keep '+' and '#' so "C++" and "C#" survive tokenization
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+QUERY_WORD_RE = re.compile(r'[a-z]+')
+_COMPANY_RE = re.compile(r'(?:at|@|with|from|worked at|working at|currently at)\s+([A-Z][A-Za-z0-9&.\' ]{2,25})')
+_CAPITALIZED_NAME_RE = re.compile(r'\b([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)\b')
+_YEARS_RE = re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s+)?(?:experience)?', re.IGNORECASE)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def query_keywords(query: str) -> list[str]:
+    """Meaningful keywords from a query (3+ chars, no stopwords)."""
+    query_lower = query.lower()
+    words = [w for w in QUERY_WORD_RE.findall(query_lower) if len(w) >= 3 and w not in HEURISTIC_STOPWORDS]
+    return words or QUERY_WORD_RE.findall(query_lower)
+
+
+class SkillTrie:
+    """
+    Token-level trie for multi-word skill names. Matching walks the token
+    list once, taking the longest skill that starts at each token, so the
+    cost is linear in the profile length regardless of how many skills
+    are registered.
+    """
+
+    def __init__(self, skills: list[tuple[str, list[str]]]):
+        self._root = {}
+        for display, variants in skills:
+            for spelling in [display, *variants]:
+                node = self._root
+                for token in tokenize(spelling):
+                    node = node.setdefault(token, {})
+                node[None] = display  # None marks the end of a skill
+
+    def find_all(self, tokens: list[str]) -> list[str]:
+        """Return skills found in ``tokens``, in order of appearance."""
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self._root.get(tokens[i])
+            match, end = None, i
+            j = i
+            while node is not None:
+                j += 1
+                if None in node:
+                    match, end = node[None], j
+                node = node.get(tokens[j]) if j < len(tokens) else None
+            if match is not None:
+                found.append(match)
+                i = end
+            else:
+                i += 1
+        return found
+
+
+TECH_SKILL_TRIE = SkillTrie(TECH_SKILLS)
+TITLE_SKILL_TRIE = SkillTrie(TITLE_SKILLS)
+
+# Deterministic mode derives the tie-breaking jitter from a hash of
+# (query, url) instead of random, so the same candidate always gets the
+# same score and results can be memoized across requests.
+HEURISTIC_DETERMINISTIC = os.getenv("HEURISTIC_DETERMINISTIC", "1").lower() not in ("0", "false", "no")
+
+# Memoized heuristic results (score, labels and personalized reason) keyed on
+# (query, url). Only used in deterministic mode.
+heuristic_memo = MemoryCache(
+    max_entries=int(os.getenv("HEURISTIC_MEMO_MAX_ENTRIES", "10000")),
+    ttl=float(os.getenv("HEURISTIC_MEMO_TTL", "86400")),
+)
+
+
+def _stable_jitter(query: str, url: str) -> int:
+    """Jitter in [-3, 3] that is stable across calls and processes."""
+    digest = hashlib.blake2b(f"{query}\0{url}".encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % 7 - 3
+
+
+def _extract_companies(content_raw: str) -> list[str]:
+    known_companies = _COMPANY_RE.findall(content_raw)
+    # Also try to grab capitalized multi-word names that look like companies
+    if not known_companies:
+        known_companies = _CAPITALIZED_NAME_RE.findall(content_raw)
+
+    # Filter out LinkedIn UI artifacts and dedupe
+    companies = []
+    for c in known_companies:
+        c_clean = c.strip()
+        if c_clean.lower() not in COMPANY_BLOCKLIST and c_clean not in companies and len(c_clean) > 2:
+            companies.append(c_clean)
+        if len(companies) >= 3:
+            break
+    return companies
+
+
+def _extract_skills(content_tokens: list[str], title_tokens: list[str]) -> list[str]:
+    all_found = TECH_SKILL_TRIE.find_all(content_tokens) + TITLE_SKILL_TRIE.find_all(title_tokens)
+    # Normalize and dedupe
+    unique_skills = []
+    seen = set()
+    for s in all_found:
+        normalized = SKILL_NORMALIZE.get(s.lower(), s)
+        if normalized.lower() not in seen:
+            seen.add(normalized.lower())
+            unique_skills.append(normalized)
+        if len(unique_skills) >= 5:
+            break
+    return unique_skills
+
+
+def extract_profile_features(candidate: CandidateRecord) -> dict:
+    """
+    Everything the heuristic scorer needs from a profile that does not
+    depend on the query. JSON-serializable, so it can be stored and
+    reused while the profile text is unchanged.
+    """
+    title_raw = candidate.title or ''
+    content_raw = candidate.content or ''
+    title_tokens = tokenize(title_raw)
+    content_tokens = tokenize(content_raw)
+
+    # Candidate name from title (usually "FirstName LastName - Title | LinkedIn")
+    name = title_raw.split(' - ')[0].split(' | ')[0].split(' – ')[0].strip()
+    if len(name) > 40 or not name:
+        name = "This candidate"
+
+    exp_match = _YEARS_RE.findall(content_raw)
+
+    return {
+        "title_tokens": sorted(set(title_tokens)),
+        "tokens": sorted(set(title_tokens).union(content_tokens)),
+        "content_len": len(content_raw),
+        "name": name,
+        # Companies/organizations mentioned in content
+        "companies": _extract_companies(content_raw),
+        # Tech skills / tools / design tools from content and title.
+        # These are the ONLY source of tags — never use raw query words as tags
+        "skills": _extract_skills(content_tokens, title_tokens),
+        "years_exp": max([int(y) for y in exp_match], default=0),
+    }
+
+
+class HeuristicScorer:
+    """
+    Text-based fallback scorer when Gemini is unavailable. Build one per
+    query; the query keywords are extracted once and reused for every
+    candidate, so scoring large pools is cheap.
+    Produces varied scores and personalized analysis per candidate.
+    """
+
+    def __init__(self, query: str, deterministic: bool = None):
+        self.query = query
+        self.deterministic = HEURISTIC_DETERMINISTIC if deterministic is None else deterministic
+        self.query_words = query_keywords(query)
+
+    def score_many(self, candidates: list[CandidateRecord], features: list[dict] = None) -> list[dict]:
+        """Score a batch of candidates, in order, optionally with precomputed features."""
+        if features is None:
+            return [self.score(candidate) for candidate in candidates]
+        return [self.score(candidate, f) for candidate, f in zip(candidates, features)]
+
+    def score(self, candidate: CandidateRecord, features: dict = None) -> dict:
+        """Score one candidate. ``features`` from ``extract_profile_features`` skips re-extraction."""
+        if not self.deterministic:
+            return self._score(candidate, features)
+
+        # Memo entries remember which title/content they were computed from,
+        # so a profile whose text changed under the same URL is re-scored.
+        key = (self.query, candidate.url or '')
+        fingerprint = hash((candidate.title, candidate.content))
+        cached = heuristic_memo.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return dict(cached[1])
+        scores = self._score(candidate, features)
+        heuristic_memo.set(key, (fingerprint, scores))
+        return dict(scores)
+
+    def _score(self, candidate: CandidateRecord, features: dict = None) -> dict:
+        if features is None:
+            features = extract_profile_features(candidate)
+        title_set = set(features["title_tokens"])
+        full_set = set(features["tokens"])
+
+        # --- Signal 1: Keyword overlap (40% weight) ---
+        if self.query_words:
+            matches = sum(1 for w in self.query_words if w in full_set)
+            keyword_score = (matches / len(self.query_words)) * 100
+        else:
+            keyword_score = 50
+
+        # --- Signal 2: Title relevance (35% weight) ---
+        if self.query_words:
+            title_matches = sum(1 for w in self.query_words if w in title_set)
+            title_score = (title_matches / len(self.query_words)) * 100
+        else:
+            title_score = 50
+
+        # --- Signal 3: Content richness (25% weight) ---
+        content_len = features["content_len"]
+        if content_len > 1000:
+            richness_score = 90
+        elif content_len > 500:
+            richness_score = 70
+        elif content_len > 200:
+            richness_score = 50
+        elif content_len > 50:
+            richness_score = 35
+        else:
+            richness_score = 20
+
+        # Weighted combination
+        raw_score = (keyword_score * 0.40) + (title_score * 0.35) + (richness_score * 0.25)
+
+        # Add small jitter to avoid ties, clamp to 25-95
+        if self.deterministic:
+            jitter = _stable_jitter(self.query, candidate.url or '')
+        else:
+            jitter = random.randint(-3, 3)
+        final_score = max(25, min(95, int(raw_score + jitter)))
+
+        # Map score to confidence level (softer labels)
+        if final_score >= 75:
+            confidence = "Strong Match"
+        elif final_score >= 50:
+            confidence = "Good Match"
+        else:
+            confidence = "Partial Match"
+
+        # Skills display — ONLY real skills, never raw query words
+        unique_skills = features["skills"]
+        skills_str = ", ".join(unique_skills) if unique_skills else "General Match"
+
+        # --- Build personalized reason ---
+        reason = _build_personalized_reason(features["name"], features["companies"], unique_skills,
+                                            features["years_exp"], final_score, self.query)
+
+        return {
+            "score": final_score / 100.0,
+            "match_percentage": final_score,
+            "confidence_level": confidence,
+            "primary_skills": skills_str,
+            "reason": reason,
+            "skill_match_score": final_score,
+            "experience_relevance": max(25, min(95, int(title_score + jitter))),
+            "public_signal_strength": max(25, min(95, int(richness_score + jitter)))
+        }
+
+
+def _heuristic_score(query: str, candidate: CandidateRecord) -> dict:
+    """Score a single candidate. Prefer ``HeuristicScorer`` when scoring many."""
+    return HeuristicScorer(query).score(candidate)
+
+
+def _build_personalized_reason(name: str, companies: list, skills: list, years_exp: int, score: int, query: str) -> str:
+    """Build a unique, human-readable analysis blurb for a candidate."""
+    parts = []
+
+    # Lead with candidate name
+    if score >= 75:
+        parts.append(f"{name} is a strong match")
+    elif score >= 50:
+        parts.append(f"{name} shows moderate alignment")
+    else:
+        parts.append(f"{name} has limited overlap")
+
+    # Add company context
+    if companies:
+        if len(companies) >= 2:
+            parts.append(f"with experience at {companies[0]} and {companies[1]}")
+        else:
+            parts.append(f"with experience at {companies[0]}")
+
+    # Add years of experience
+    if years_exp > 0:
+        parts.append(f"bringing {years_exp}+ years of experience")
+
+    # Add specific skills
+    if skills:
+        skill_sample = skills[:3]
+        if len(skill_sample) >= 2:
+            parts.append(f"with expertise in {', '.join(skill_sample[:-1])} and {skill_sample[-1]}")
+        else:
+            parts.append(f"skilled in {skill_sample[0]}")
+
+    # Build the sentence
+    reason = ", ".join(parts) + "."
+
+    # Add a closing insight based on score
+    if score >= 85:
+        reason += " Highly recommended for outreach."
+    elif score >= 70:
+        reason += " Worth considering for initial screening."
+    elif score >= 50:
+        reason += " Could be a fit with further evaluation."
+
+    return reason
@@ -0,0 +1,143 @@
+"""Local BM25 index over stored profiles, for local-first candidate search."""
+
+import os
+import math
+import heapq
+import threading
+from collections import Counter
+
+from .candidate import CandidateRecord
+from .heuristic import HEURISTIC_STOPWORDS, query_keywords, tokenize
+from .store import get_candidate_store
+from .warm import warm
+
+
+# Local-first search: answer from previously seen profiles and only call
+# Tavily when fewer than LOCAL_MIN_RESULTS local profiles cover at least
+# LOCAL_MIN_COVERAGE of the query keywords.
+LOCAL_FIRST = os.getenv("LOCAL_FIRST", "0").lower() in ("1", "true", "yes")
+LOCAL_MIN_RESULTS = int(os.getenv("LOCAL_MIN_RESULTS", "5"))
+LOCAL_MIN_COVERAGE = float(os.getenv("LOCAL_MIN_COVERAGE", "0.5"))
+LOCAL_MAX_RESULTS = 10
+
+
+def index_terms(text: str) -> list[str]:
+    """Document terms, tokenized and stopword-filtered like the heuristic scorer."""
+    return [t for t in tokenize(text) if len(t) >= 2 and t not in HEURISTIC_STOPWORDS]
+
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 ranking."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}  # term -> {doc_id: term frequency}
+        self._doc_terms = {}  # doc_id -> distinct terms, for removal
+        self._doc_len = {}
+        self._total_len = 0
+        self._norms = None  # doc_id -> BM25 length normalization, rebuilt after changes
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous version."""
+        if doc_id in self._doc_len:
+            self.remove(doc_id)
+        terms = index_terms(text)
+        counts = Counter(terms)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._doc_terms[doc_id] = list(counts)
+        self._doc_len[doc_id] = len(terms)
+        self._total_len += len(terms)
+        self._norms = None
+
+    def remove(self, doc_id: str) -> None:
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        self._norms = None
+
+    def search(self, query_terms: list[str], k: int = 10) -> list[tuple[str, float, int]]:
+        """Top ``k`` documents as (doc_id, bm25 score, number of query terms matched)."""
+        n_docs = len(self._doc_len)
+        if not n_docs:
+            return []
+        if self._norms is None:
+            avgdl = self._total_len / n_docs or 1.0
+            k1, b = self.k1, self.b
+            self._norms = {d: k1 * (1 - b + b * dl / avgdl) for d, dl in self._doc_len.items()}
+        norms = self._norms
+        k1_plus_1 = self.k1 + 1
+        scores = {}
+        matched = {}
+        for term in set(query_terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            weight = idf * k1_plus_1
+            for doc_id, tf in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score, matched[doc_id]) for doc_id, score in top]
+
+
+class LocalCandidateIndex:
+    """
+    BM25 index over stored candidate profiles, keyed by profile URL.
+    Requests add to and search it from worker threads, so both go through
+    a lock.
+    """
+
+    def __init__(self):
+        self.index = BM25Index()
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add_candidates(self, candidates: list[CandidateRecord]) -> None:
+        with self._lock:
+            for cand in candidates:
+                if not cand.url:
+                    continue
+                self._docs[cand.url] = cand.copy()
+                self.index.add(cand.url, f"{cand.title or ''} {cand.content or ''}")
+
+    def search(self, query: str, k: int = LOCAL_MAX_RESULTS,
+               min_coverage: float = LOCAL_MIN_COVERAGE) -> list[CandidateRecord]:
+        """Best-matching stored candidates covering at least ``min_coverage`` of the query keywords."""
+        keywords = list(dict.fromkeys(query_keywords(query)))
+        if not keywords:
+            return []
+        with self._lock:
+            hits = self.index.search(keywords, k)
+            return [self._docs[url].copy() for url, _, n_matched in hits
+                    if n_matched / len(keywords) >= min_coverage]
+
+
+def _build_local_index():
+    candidate_store = get_candidate_store()
+    if candidate_store is None:
+        return None
+    index = LocalCandidateIndex()
+    index.add_candidates(list(candidate_store.iter_profiles()))
+    print(f"Built local candidate index: {len(index)} profiles")
+    return index
+
+
+def get_local_index():
+    """
+    The process-wide local index, built from the candidate store on first
+    use. Building reads and tokenizes every stored profile, so call this
+    (and search the index) off the event loop.
+    """
+    return warm("local_index", _build_local_index)
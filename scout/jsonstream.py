@@ -0,0 +1,87 @@
+"""Incremental parsing of a JSON array that arrives in chunks."""
+
+import re
+import json
+
+# Characters that can change the parser's state; everything else is skipped over
+_SPECIAL_RE = re.compile(r'[\[\]{}"\\]')
+
+
+class JsonArrayParser:
+    """
+    Feed a streamed JSON array chunk by chunk; ``feed`` returns each
+    top-level object as soon as its closing brace arrives. Text before the
+    opening bracket (a markdown fence, say) is ignored, and an element that
+    doesn't parse is counted in ``skipped`` and dropped without losing the
+    elements around it.
+    """
+
+    def __init__(self):
+        self.skipped = 0
+        self.done = False  # the array's closing bracket has been seen
+        self._buffer = ""
+        self._pos = 0  # next character of _buffer to scan
+        self._started = False
+        self._depth = 0  # nesting inside the array; 0 = between elements
+        self._in_string = False
+        self._element_start = None  # buffer offset of the element being read
+
+    @property
+    def pending(self) -> bool:
+        """Whether an element was cut off mid-way (so far)."""
+        return self._element_start is not None
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume ``chunk`` and return the objects it completed, in order."""
+        buffer = self._buffer + chunk
+        items = []
+        i = self._pos
+        while not self.done:
+            match = _SPECIAL_RE.search(buffer, i)
+            if match is None:
+                i = len(buffer)
+                break
+            i = match.start()
+            ch = buffer[i]
+            if ch == "\\":
+                if i + 1 >= len(buffer):
+                    break  # the escaped character is in the next chunk
+                i += 2
+                continue
+            i += 1
+            if self._in_string:
+                self._in_string = ch != '"'
+            elif ch == '"':
+                self._in_string = True
+            elif not self._started:
+                self._started = ch == "["
+            elif ch in "[{":
+                if self._depth == 0:
+                    self._element_start = i - 1
+                self._depth += 1
+            elif self._depth == 0:
+                self.done = ch == "]"
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parse_element(buffer[self._element_start:i], items)
+                    self._element_start = None
+
+        # Keep only the unfinished element (if any) and what's left to scan
+        keep = self._element_start if self._element_start is not None else i
+        self._buffer = buffer[keep:]
+        self._pos = i - keep
+        if self._element_start is not None:
+            self._element_start = 0
+        return items
+
+    def _parse_element(self, text: str, items: list) -> None:
+        try:
+            item = json.loads(text)
+        except ValueError:
+            self.skipped += 1
+            return
+        if isinstance(item, dict):
+            items.append(item)
+        else:
+            self.skipped += 1
@@ -0,0 +1,525 @@
+"""LLM backends and the retrying, rate-limited, hedged call path in front of them."""
+
+import os
+import re
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import contextvars
+from collections import Counter, deque
+
+from .cache import make_cache
+from .deadline import deadline_remaining
+from .jsonstream import JsonArrayParser
+from .metrics import metrics, span
+from .warm import warm
+
+
+# ─── LLM Backends ─────────────────────────────────────────────────────
+
+# Model fallback chain — if one model's quota is exhausted, try the next
+GEMINI_MODELS = ["gemini-2.0-flash", "gemini-2.0-flash-lite", "gemini-1.5-flash"]
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+
+
+def _make_gemini_client():
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("WARNING: GEMINI_API_KEY not set. AI analysis will not work.")
+        return None
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+def get_gemini_client():
+    """The shared Gemini client, or None when GEMINI_API_KEY is not set."""
+    return warm("gemini_client", _make_gemini_client)
+
+
+class GeminiLLM:
+    """Gemini models through the shared async google-genai client."""
+
+    name = "gemini"
+    models = GEMINI_MODELS
+    missing_config = "GEMINI_API_KEY is not configured. Set it in environment variables."
+
+    def configured(self) -> bool:
+        return get_gemini_client() is not None
+
+    @staticmethod
+    def _config(schema: dict = None):
+        """Structured output: with a response schema, Gemini can only answer with JSON matching it."""
+        if schema is None:
+            return None
+        return {"response_mime_type": "application/json", "response_schema": schema}
+
+    async def generate(self, model: str, prompt: str, schema: dict = None) -> str:
+        response = await get_gemini_client().aio.models.generate_content(
+            model=model, contents=prompt, config=self._config(schema)
+        )
+        return response.text
+
+    async def stream(self, model: str, prompt: str, schema: dict = None):
+        """Yield the response text in chunks as the model writes it."""
+        stream = await get_gemini_client().aio.models.generate_content_stream(
+            model=model, contents=prompt, config=self._config(schema)
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+
+# Registered LLM backends; LLM_BACKEND picks one by name. A backend lists
+# its ``models`` in fallback order and implements ``configured()``,
+# ``generate()`` and ``stream()``, both taking an optional JSON response
+# ``schema``; retries, rate limiting, hedging and caching below apply to
+# whichever backend is active.
+LLM_BACKENDS = {GeminiLLM.name: GeminiLLM}
+
+
+def _make_llm():
+    backend = LLM_BACKENDS.get(LLM_BACKEND)
+    if backend is None:
+        print(f"WARNING: unknown LLM_BACKEND {LLM_BACKEND!r}, using gemini.")
+        backend = GeminiLLM
+    return backend()
+
+
+def get_llm():
+    return warm("llm", _make_llm)
+
+
+# LLM responses, keyed on (model, normalized prompt). Configure with
+# GEMINI_CACHE_BACKEND=memory|sqlite|none, GEMINI_CACHE_TTL (seconds),
+# GEMINI_CACHE_MAX_ENTRIES and GEMINI_CACHE_PATH (sqlite only).
+gemini_cache = make_cache(
+    os.getenv("GEMINI_CACHE_BACKEND", "memory"),
+    ttl=float(os.getenv("GEMINI_CACHE_TTL", "3600")),
+    max_entries=int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "256")),
+    path=os.getenv("GEMINI_CACHE_PATH"),
+)
+
+
+def _gemini_cache_key(model: str, prompt: str) -> str:
+    """Content-addressed key: whitespace differences in a prompt don't matter."""
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{model}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+def _cached_gemini_response(prompt: str):
+    """Return a cached response from any model in the fallback chain, or None."""
+    if gemini_cache is None:
+        return None
+    return gemini_cache.get_first([_gemini_cache_key(model, prompt) for model in get_llm().models])
+
+
+# ─── Gemini Rate Limiting ─────────────────────────────────────────────
+
+# Process-wide, per-model request budget. Each model in GEMINI_MODELS gets a
+# token bucket (GEMINI_RPM requests/minute, bursts of GEMINI_BURST; 0 RPM
+# disables it) whose rate halves on every 429 and creeps back on success,
+# plus a circuit breaker that skips the model for GEMINI_BREAKER_COOLDOWN
+# seconds after GEMINI_BREAKER_THRESHOLD consecutive 429s, or for as long as
+# a retry-after hint says when that is longer than GEMINI_MAX_RETRY_WAIT.
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "15"))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))
+GEMINI_MAX_QUEUE_WAIT = float(os.getenv("GEMINI_MAX_QUEUE_WAIT", "2"))
+GEMINI_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1"))
+GEMINI_MAX_RETRY_WAIT = float(os.getenv("GEMINI_MAX_RETRY_WAIT", "8"))
+GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "3"))
+GEMINI_BREAKER_COOLDOWN = float(os.getenv("GEMINI_BREAKER_COOLDOWN", "30"))
+
+_RETRY_DELAY_RE = re.compile(r'retryDelay[\'"]?\s*[:=]\s*[\'"]?(\d+(?:\.\d+)?)s')
+
+
+def _rate_limit_info(error: Exception) -> tuple[bool, float]:
+    """Whether ``error`` is a 429, and the retry-after hint in seconds if it carries one."""
+    text = str(error)
+    limited = (getattr(error, "code", None) == 429
+               or getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+               or "429" in text or "RESOURCE_EXHAUSTED" in text)
+    if not limited:
+        return False, None
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers:
+        try:
+            return True, float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    match = _RETRY_DELAY_RE.search(text)
+    return True, float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts: halved on throttling, recovered on success."""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.max_rate = rate_per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, max_wait: float):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    async def acquire(self, max_wait: float) -> bool:
+        """Take a token, waiting at most ``max_wait`` seconds for one."""
+        if self.max_rate <= 0:
+            return True
+        wait = self._reserve(max_wait)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    def throttled(self) -> None:
+        with self._lock:
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; one failed probe after the cooldown re-opens it."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def allow(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def remaining(self) -> float:
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self, open_for: float = None) -> bool:
+        """Count a failure; returns True if this trips the breaker."""
+        self.failures += 1
+        if self.failures < self.threshold and not open_for:
+            return False
+        self.open_until = time.monotonic() + max(self.cooldown, open_for or 0)
+        self.failures = self.threshold - 1  # half-open: the next failure re-trips
+        return True
+
+
+class ModelLimiter:
+    """Token bucket, circuit breaker and fallback counters for one Gemini model."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.bucket = TokenBucket(GEMINI_RPM, GEMINI_BURST)
+        self.breaker = CircuitBreaker(GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_COOLDOWN)
+        self.stats = Counter()
+        self.latencies = deque(maxlen=200)  # recent successful call durations, seconds
+
+    async def acquire(self) -> bool:
+        """False if the model should be skipped: circuit open or no token within GEMINI_MAX_QUEUE_WAIT."""
+        if not self.breaker.allow():
+            self.stats["skipped_open"] += 1
+            print(f"Skipping {self.model}: circuit open for another {self.breaker.remaining():.0f}s")
+            return False
+        if not await self.bucket.acquire(GEMINI_MAX_QUEUE_WAIT):
+            self.stats["skipped_throttled"] += 1
+            print(f"Skipping {self.model}: local rate limit reached")
+            return False
+        self.stats["calls"] += 1
+        return True
+
+    def p95_latency(self, min_samples: int = 20):
+        """95th percentile of recent successful call durations, or None with too few samples."""
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def record_success(self, fallback: bool, elapsed: float) -> None:
+        self.stats["successes"] += 1
+        self.latencies.append(elapsed)
+        if fallback:
+            self.stats["served_as_fallback"] += 1
+        self.bucket.succeeded()
+        self.breaker.record_success()
+
+    def record_rate_limit(self, retry_after: float, attempt: int):
+        """Record a 429; returns the delay before retrying this model, or None to move on."""
+        self.stats["rate_limited"] += 1
+        self.bucket.throttled()
+        long_hint = retry_after is not None and retry_after > GEMINI_MAX_RETRY_WAIT
+        if self.breaker.record_failure(retry_after if long_hint else None):
+            self.stats["trips"] += 1
+            print(f"Circuit opened for {self.model} for {self.breaker.remaining():.0f}s")
+            return None
+        if long_hint or attempt + 1 >= GEMINI_MAX_ATTEMPTS:
+            return None
+        self.stats["retries"] += 1
+        if retry_after is not None:
+            return retry_after + random.uniform(0, GEMINI_BACKOFF_BASE)
+        return random.uniform(0, min(GEMINI_MAX_RETRY_WAIT, GEMINI_BACKOFF_BASE * 2 ** (attempt + 1)))
+
+
+gemini_limiters = {model: ModelLimiter(model) for model in GEMINI_MODELS}
+
+
+def limiter_for(model: str) -> ModelLimiter:
+    """The shared limiter for ``model``, created on first use for non-Gemini backends."""
+    limiter = gemini_limiters.get(model)
+    if limiter is None:
+        limiter = gemini_limiters.setdefault(model, ModelLimiter(model))
+    return limiter
+
+
+def gemini_limiter_stats() -> dict:
+    """Per-model call, 429, retry, skip and fallback counters plus current limiter state."""
+    return {
+        model: {**limiter.stats,
+                "rate_per_minute": round(limiter.bucket.rate * 60, 2),
+                "circuit_open_for": round(limiter.breaker.remaining(), 1)}
+        for model, limiter in gemini_limiters.items()
+    }
+
+
+def _all_models_unavailable() -> RuntimeError:
+    return RuntimeError("All Gemini models are rate limited or cooling down.")
+
+
+# ─── Gemini Hedging ───────────────────────────────────────────────────
+
+# Optional hedged calls: if the primary model hasn't answered within
+# GEMINI_HEDGE_AFTER seconds ("auto" = its observed p95, GEMINI_HEDGE_DEFAULT_AFTER
+# until enough samples exist), fire the same prompt at the next model and take
+# whichever valid response lands first. Each request may hedge at most
+# GEMINI_HEDGE_BUDGET times; calls made outside a request never hedge.
+GEMINI_HEDGE = os.getenv("GEMINI_HEDGE", "0").lower() in ("1", "true", "yes")
+GEMINI_HEDGE_AFTER = os.getenv("GEMINI_HEDGE_AFTER", "auto")
+GEMINI_HEDGE_DEFAULT_AFTER = float(os.getenv("GEMINI_HEDGE_DEFAULT_AFTER", "4"))
+GEMINI_HEDGE_BUDGET = int(os.getenv("GEMINI_HEDGE_BUDGET", "2"))
+
+gemini_hedge_stats = Counter()
+_hedge_budget = contextvars.ContextVar("hedge_budget", default=None)
+
+
+class HedgeBudget:
+    """Hedges left for the current request; shared by every task it spawns."""
+
+    def __init__(self, hedges: int):
+        self.remaining = hedges
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+def start_hedge_budget() -> None:
+    """Give the current request (and the tasks it creates) its own hedge budget."""
+    _hedge_budget.set(HedgeBudget(GEMINI_HEDGE_BUDGET))
+
+
+def _hedge_after(model: str) -> float:
+    if GEMINI_HEDGE_AFTER.lower() != "auto":
+        return float(GEMINI_HEDGE_AFTER)
+    p95 = limiter_for(model).p95_latency()
+    return p95 if p95 is not None else GEMINI_HEDGE_DEFAULT_AFTER
+
+
+async def _hedged_gemini_call(prompt: str, span_attrs: dict = None) -> str:
+    """Race the primary model chain against the rest of the chain once the primary is slow."""
+    models = get_llm().models
+    primary_model = models[0]
+    primary = asyncio.ensure_future(call_llm_chain(prompt, models, span_attrs))
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=_hedge_after(primary_model))
+        if done:
+            return primary.result()
+
+        budget = _hedge_budget.get()
+        if not budget.take():
+            gemini_hedge_stats["budget_exhausted"] += 1
+            return await primary
+
+        gemini_hedge_stats["fired"] += 1
+        print(f"{primary_model} slower than {_hedge_after(primary_model):.1f}s, hedging with {models[1]}...")
+        if span_attrs is not None:
+            span_attrs["hedged"] = True
+        hedge = asyncio.ensure_future(call_llm_chain(prompt, models[1:], span_attrs))
+        pending.add(hedge)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.exception() and task.result():
+                    gemini_hedge_stats["hedge_won" if task is hedge else "primary_won"] += 1
+                    return task.result()
+        gemini_hedge_stats["both_failed"] += 1
+        return primary.result()  # raises the primary's error if it had one
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# ─── LLM Calls ────────────────────────────────────────────────────────
+
+async def call_llm(prompt: str) -> str:
+    """Helper to call the LLM backend with retry + model fallback for 429 errors.
+
+    Uses the async client and ``asyncio.sleep`` backoff so a rate-limited
+    request never stalls other requests sharing the uvicorn worker. Models whose
+    circuit is open or whose local budget is spent are skipped outright. With
+    GEMINI_HEDGE on, a slow primary model is raced against the next one.
+    """
+    llm = get_llm()
+    if not llm.configured():
+        raise RuntimeError(llm.missing_config)
+
+    with span("gemini", prompt_chars=len(prompt), attempts=0) as attrs:
+        cached = _cached_gemini_response(prompt)
+        attrs["cache_hit"] = cached is not None
+        if cached is not None:
+            return cached
+
+        if (GEMINI_HEDGE and len(llm.models) > 1 and _hedge_budget.get() is not None
+                and limiter_for(llm.models[0]).breaker.allow()):
+            return await _hedged_gemini_call(prompt, attrs)
+        return await call_llm_chain(prompt, llm.models, attrs)
+
+
+async def call_llm_chain(prompt: str, models: list[str], span_attrs: dict = None) -> str:
+    """Try ``models`` in order, retrying each on 429s within its limiter's budget.
+
+    ``span_attrs``, if given, receives the attempt count and the model that answered.
+    """
+    span_attrs = span_attrs if span_attrs is not None else {}
+    llm = get_llm()
+    last_error = None
+    for model in models:
+        limiter = limiter_for(model)
+        for attempt in range(GEMINI_MAX_ATTEMPTS):
+            if not await limiter.acquire():
+                break
+            span_attrs["attempts"] = span_attrs.get("attempts", 0) + 1
+            start = time.monotonic()
+            try:
+                text = await llm.generate(model, prompt)
+            except Exception as e:
+                rate_limited, retry_after = _rate_limit_info(e)
+                metrics.inc("scout_gemini_requests_total", model=model,
+                            outcome="rate_limited" if rate_limited else "error")
+                if not rate_limited:
+                    raise  # non-429 error, re-raise immediately
+                last_error = e
+                delay = limiter.record_rate_limit(retry_after, attempt)
+                remaining = deadline_remaining()
+                if delay is None or (remaining is not None and delay >= remaining):
+                    print(f"Model {model} rate limited, trying next model...")
+                    break
+                print(f"Rate limited on {model} (attempt {attempt+1}/{GEMINI_MAX_ATTEMPTS}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                continue
+            elapsed = time.monotonic() - start
+            limiter.record_success(fallback=model != llm.models[0], elapsed=elapsed)
+            metrics.inc("scout_gemini_requests_total", model=model, outcome="ok")
+            metrics.observe("scout_gemini_request_duration_seconds", elapsed, model=model)
+            span_attrs["model"] = model
+            if gemini_cache is not None and text:
+                gemini_cache.set(_gemini_cache_key(model, prompt), text)
+            return text
+
+    raise last_error or _all_models_unavailable()  # all models and retries exhausted
+
+
+async def call_llm_stream(prompt: str, schema: dict = None):
+    """Streaming variant of ``call_llm`` that yields text chunks as they arrive.
+
+    Retries and model fallback only apply until the first chunk is yielded;
+    after that, errors propagate to the caller. With a ``schema`` the model
+    answers in structured-output mode with JSON matching it.
+    """
+    llm = get_llm()
+    if not llm.configured():
+        raise RuntimeError(llm.missing_config)
+
+    cached = _cached_gemini_response(prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    last_error = None
+    for position, model in enumerate(llm.models):
+        limiter = limiter_for(model)
+        for attempt in range(GEMINI_MAX_ATTEMPTS):
+            if not await limiter.acquire():
+                break
+            emitted = False
+            start = time.monotonic()
+            try:
+                parts = []
+                async for text in llm.stream(model, prompt, schema):
+                    emitted = True
+                    parts.append(text)
+                    yield text
+            except Exception as e:
+                if emitted:
+                    raise
+                rate_limited, retry_after = _rate_limit_info(e)
+                metrics.inc("scout_gemini_requests_total", model=model,
+                            outcome="rate_limited" if rate_limited else "error")
+                if not rate_limited:
+                    raise
+                last_error = e
+                delay = limiter.record_rate_limit(retry_after, attempt)
+                if delay is None:
+                    print(f"Model {model} rate limited, trying next model...")
+                    break
+                print(f"Rate limited on {model} (attempt {attempt+1}/{GEMINI_MAX_ATTEMPTS}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                continue
+            elapsed = time.monotonic() - start
+            limiter.record_success(fallback=position > 0, elapsed=elapsed)
+            metrics.inc("scout_gemini_requests_total", model=model, outcome="ok")
+            metrics.observe("scout_gemini_request_duration_seconds", elapsed, model=model)
+            if gemini_cache is not None and parts:
+                gemini_cache.set(_gemini_cache_key(model, prompt), "".join(parts))
+            return
+
+    raise last_error or _all_models_unavailable()
+
+
+async def call_llm_items(prompt: str, schema: dict):
+    """
+    Structured-output call for a JSON array response: yields each object of
+    the array as soon as it has streamed in, so callers can act on the first
+    items while the model is still writing the rest. A malformed element is
+    skipped without losing the others; if the stream breaks off, the items
+    already yielded stand and the error propagates.
+    """
+    parser = JsonArrayParser()
+    with span("gemini", prompt_chars=len(prompt), streamed=True) as attrs:
+        async for chunk in call_llm_stream(prompt, schema):
+            for item in parser.feed(chunk):
+                yield item
+        attrs["skipped"] = parser.skipped
+    if parser.skipped or parser.pending:
+        print(f"Structured response had {parser.skipped} malformed item(s)"
+              f"{' and was cut off' if parser.pending else ''}; kept the rest.")
@@ -0,0 +1,128 @@
+"""Process-wide Prometheus metrics and per-request timing traces."""
+
+import os
+import time
+import threading
+import contextvars
+import contextlib
+
+
+# Append each request's timing spans to AnalysisResponse.stdout_log
+STDOUT_LOG_SPANS = os.getenv("STDOUT_LOG_SPANS", "0").lower() in ("1", "true", "yes")
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60)
+
+
+class Metrics:
+    """Process-wide counters, gauges and latency histograms in the Prometheus text format."""
+
+    def __init__(self, buckets: tuple = METRICS_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._types = {}  # metric name -> counter | gauge | histogram
+        self._values = {}  # (name, labels) -> value, or histogram [bucket counts..., sum, count]
+
+    @staticmethod
+    def _labels(labels: dict) -> tuple:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._types[name] = "counter"
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name: str, value: float, kind: str = "gauge", **labels) -> None:
+        """Set a value sampled from elsewhere, e.g. a counter another component keeps."""
+        with self._lock:
+            self._types[name] = kind
+            self._values[(name, self._labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._types[name] = "histogram"
+            hist = self._values.get(key)
+            if hist is None:
+                hist = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[i] += 1
+            hist[-2] += value
+            hist[-1] += 1
+
+    def render(self) -> str:
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            items = sorted(self._values.items())
+            types = dict(self._types)
+        last_name = None
+        for (name, labels), value in items:
+            if name != last_name:
+                lines.append(f"# TYPE {name} {types[name]}")
+                last_name = name
+            if types[name] != "histogram":
+                lines.append(f"{name}{fmt(labels)} {value}")
+                continue
+            for bound, count in zip(self.buckets, value):
+                lines.append(f"{name}_bucket{fmt(labels, [('le', str(bound))])} {count}")
+            lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {value[-1]}")
+            lines.append(f"{name}_sum{fmt(labels)} {round(value[-2], 6)}")
+            lines.append(f"{name}_count{fmt(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class Trace:
+    """The timing spans recorded for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def format(self) -> str:
+        lines = []
+        for s in sorted(self.spans, key=lambda s: s["start"]):
+            attrs = " ".join(f"{k}={v}" for k, v in s.items() if k not in ("stage", "start", "duration"))
+            lines.append(f"+{s['start']:6.2f}s {s['stage']:<16} {s['duration']:6.2f}s {attrs}".rstrip())
+        return "\n".join(lines)
+
+
+_trace = contextvars.ContextVar("trace", default=None)
+
+
+def start_trace() -> Trace:
+    """Collect spans for the current request (and the tasks it creates)."""
+    trace = Trace()
+    _trace.set(trace)
+    return trace
+
+
+@contextlib.contextmanager
+def span(stage: str, **attrs):
+    """
+    Time a block as ``stage``. Yields a dict the block can add attributes
+    to; the duration feeds the scout_stage_duration_seconds histogram and,
+    inside a request, the request's Trace.
+    """
+    start = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        metrics.observe("scout_stage_duration_seconds", duration, stage=stage)
+        trace = _trace.get()
+        if trace is not None:
+            trace.spans.append({"stage": stage, "start": round(start - trace.started, 3),
+                                "duration": round(duration, 3), **attrs})
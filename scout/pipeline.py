@@ -0,0 +1,173 @@
+"""The end-to-end analysis pipeline for one job description."""
+
+import time
+import asyncio
+
+from .candidate import CandidateRecord
+from .deadline import REQUEST_DEADLINE, start_deadline
+from .heuristic import HeuristicScorer, heuristic_memo
+from .index import LOCAL_FIRST
+from .llm import gemini_cache, gemini_hedge_stats, gemini_limiter_stats, start_hedge_budget
+from .metrics import metrics, start_trace
+from .report import assemble_report, fallback_ranking, generate_ranking_narrative, summarize_requirements
+from .scoring import heuristic_result, score_candidates
+from .search import (TAVILY_MAX_RESULTS, condense_query, fetch_candidates, local_recall_sufficient, search_local,
+                     tavily_cache)
+
+
+class PipelineScheduler:
+    """
+    Tiny DAG scheduler for async stages. Each stage starts as soon as the
+    stages it depends on have finished, receives their results as
+    positional arguments, and has its wall-clock duration recorded.
+    """
+
+    def __init__(self):
+        self._stages = {}  # name -> (coroutine function, dependency names)
+        self.timings = {}  # name -> seconds
+
+    def add(self, name: str, fn, deps: tuple = ()) -> None:
+        missing = [d for d in deps if d not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {missing}")
+        self._stages[name] = (fn, tuple(deps))
+
+    async def run(self, timeout: float = None) -> dict:
+        """
+        Run every stage and return their results keyed by stage name. Stages
+        still running after ``timeout`` seconds are cancelled and left out of
+        the results.
+        """
+        tasks = {}
+
+        async def run_stage(name):
+            fn, deps = self._stages[name]
+            inputs = [await tasks[d] for d in deps]
+            start = time.perf_counter()
+            try:
+                return await fn(*inputs)
+            finally:
+                self.timings[name] = round(time.perf_counter() - start, 3)
+
+        for name in self._stages:
+            tasks[name] = asyncio.ensure_future(run_stage(name))
+
+        try:
+            done, pending = await asyncio.wait(tasks.values(), timeout=timeout,
+                                               return_when=asyncio.FIRST_EXCEPTION)
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        for task in pending:
+            task.cancel()
+        failed = [task for task in done if task.exception() is not None]
+        if failed:
+            raise failed[0].exception()
+        if pending:
+            print(f"Deadline reached, cancelled stage(s): {[n for n, t in tasks.items() if t in pending]}")
+        return {name: task.result() for name, task in tasks.items() if task in done}
+
+
+async def run_recruitment_agent(job_description: str, max_results: int = TAVILY_MAX_RESULTS,
+                                deadline: float = REQUEST_DEADLINE) -> dict:
+    """
+    Main orchestrator. Stages run as a dependency graph:
+
+        local ──> condense ──> search ──> score ──> narrative ──┐
+        summary ───────────────────────────────────────────────┴──> report
+
+    The requirements summary only needs the job description, so it runs
+    alongside search and scoring instead of after them. In local-first mode
+    a sufficient local index hit skips query condensing and Tavily.
+
+    The whole run is bounded by ``deadline`` seconds (REQUEST_DEADLINE for
+    synchronous requests, JOB_DEADLINE for background jobs). Stages degrade as the
+    budget runs low, and whatever has finished by the deadline is returned:
+    unscored candidates get heuristic scores and a missing summary or
+    narrative is replaced by its templated fallback.
+
+    Timing spans for every stage and Gemini call are returned under "trace".
+    """
+    start_hedge_budget()
+    deadline = start_deadline(deadline)
+    trace = start_trace()
+
+    async def local():
+        return await asyncio.to_thread(search_local, job_description) if LOCAL_FIRST else None
+
+    async def condense(local_hits):
+        if local_hits and local_recall_sufficient(local_hits):
+            return None
+        return await condense_query(job_description)
+
+    async def search(condensed_query, local_hits):
+        return await fetch_candidates(job_description, condensed_query, local_hits, max_results)
+
+    async def score(candidates):
+        return await score_candidates(job_description, candidates)
+
+    async def narrative(search_results):
+        if not search_results:
+            return None
+        # score_candidates already returns results ranked by score
+        return await generate_ranking_narrative(job_description, search_results)
+
+    pipeline = PipelineScheduler()
+    pipeline.add("local", local)
+    pipeline.add("condense", condense, deps=("local",))
+    pipeline.add("summary", lambda: summarize_requirements(job_description))
+    pipeline.add("search", search, deps=("condense", "local"))
+    pipeline.add("score", score, deps=("search",))
+    pipeline.add("narrative", narrative, deps=("score",))
+    results = await pipeline.run(timeout=deadline.remaining())
+
+    search_results = results.get("score")
+    if search_results is None:
+        # Keep the Gemini scores that streamed in before the deadline
+        scorer = HeuristicScorer(job_description)
+        search_results = [cand if cand.match_type else heuristic_result(scorer, cand)
+                          for cand in results.get("search") or []]
+        search_results.sort(key=lambda x: x.score, reverse=True)
+    if search_results:
+        analysis_report = assemble_report(
+            results.get("summary", job_description),
+            results.get("narrative") or fallback_ranking(search_results),
+        )
+    else:
+        analysis_report = "No matching candidates were found for this job description."
+
+    print(f"Stage timings (s): {pipeline.timings}")
+    metrics.observe("scout_request_duration_seconds", time.perf_counter() - trace.started)
+    return {
+        "search_results": search_results,
+        "analysis_report": analysis_report,
+        "timings": pipeline.timings,
+        "trace": trace
+    }
+
+
+async def search_job_candidates(query: str) -> list[CandidateRecord]:
+    """Search for potential job candidates, then score them."""
+    candidates_to_score = await fetch_candidates(query)
+    return await score_candidates(query, candidates_to_score)
+
+
+def collect_runtime_metrics() -> None:
+    """Sample cache, Gemini limiter and hedging counters into ``metrics``."""
+    caches = {"gemini": gemini_cache, "tavily": tavily_cache, "heuristic": heuristic_memo}
+    for name, cache in caches.items():
+        if cache is None:
+            continue
+        stats = cache.stats()
+        metrics.set("scout_cache_hits_total", stats["hits"], kind="counter", cache=name)
+        metrics.set("scout_cache_misses_total", stats["misses"], kind="counter", cache=name)
+        metrics.set("scout_cache_entries", stats["size"], cache=name)
+    for model, stats in gemini_limiter_stats().items():
+        metrics.set("scout_gemini_rate_per_minute", stats.pop("rate_per_minute"), model=model)
+        metrics.set("scout_gemini_circuit_open_seconds", stats.pop("circuit_open_for"), model=model)
+        for event, count in stats.items():
+            metrics.set("scout_gemini_limiter_events_total", count, kind="counter", model=model, event=event)
+    for event, count in gemini_hedge_stats.items():
+        metrics.set("scout_gemini_hedges_total", count, kind="counter", event=event)
@@ -0,0 +1,148 @@
+"""Profile page fetching: titles and images for candidate profile URLs."""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from .warm import warm
+
+if TYPE_CHECKING:
+    import requests
+
+PROFILE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+PROFILE_FETCH_CONCURRENCY = int(os.getenv("PROFILE_FETCH_CONCURRENCY", "6"))
+# Minimum seconds between two requests to the same host
+PROFILE_HOST_INTERVAL = float(os.getenv("PROFILE_HOST_INTERVAL", "0.25"))
+# Stop reading the body after this many bytes if </head> hasn't shown up
+PROFILE_HEAD_MAX_BYTES = 256 * 1024
+
+
+def _make_profile_session():
+    """Session with a connection pool sized for concurrent profile fetches."""
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=PROFILE_FETCH_CONCURRENCY, pool_maxsize=PROFILE_FETCH_CONCURRENCY
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(PROFILE_HEADERS)
+    return session
+
+
+# url -> {"etag", "last_modified", "result"} for conditional re-fetches,
+# oldest entries evicted first
+PROFILE_VALIDATOR_MAX_ENTRIES = 1000
+_profile_validators = OrderedDict()
+_profile_validators_lock = threading.Lock()
+
+# host -> monotonic time of the next allowed request
+_host_next_slot = {}
+_host_lock = threading.Lock()
+
+
+def _wait_for_host_slot(url: str) -> None:
+    """Per-host rate limit: space requests to one host PROFILE_HOST_INTERVAL apart."""
+    host = urlparse(url).netloc.lower()
+    with _host_lock:
+        now = time.monotonic()
+        slot = max(now, _host_next_slot.get(host, now))
+        _host_next_slot[host] = slot + PROFILE_HOST_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _read_head(response: "requests.Response") -> bytes:
+    """
+    Read the body only up to </head>; title and og:image live there. Returns
+    bytes so BeautifulSoup can detect the charset from <meta charset>.
+    """
+    buffer = b""
+    for chunk in response.iter_content(chunk_size=8192):
+        buffer += chunk
+        end = buffer.lower().find(b"</head>")
+        if end != -1:
+            buffer = buffer[:end + len(b"</head>")]
+            break
+        if len(buffer) >= PROFILE_HEAD_MAX_BYTES:
+            break
+    return buffer
+
+
+def analyze_candidate_profile(profile_url: str) -> dict:
+    """Analyze a candidate's LinkedIn profile or similar platform."""
+    print(f"Analyzing profile: {profile_url}")
+
+    try:
+        headers = {}
+        with _profile_validators_lock:
+            cached = _profile_validators.get(profile_url)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        _wait_for_host_slot(profile_url)
+        session = warm("profile_session", _make_profile_session)
+        with session.get(profile_url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code == 304 and cached:
+                return dict(cached["result"])
+
+            if response.status_code == 200:
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(_read_head(response), 'html.parser')
+                title_element = soup.find('title')
+                title = title_element.text if title_element else "Title not found"
+
+                image_url = None
+                og_image = soup.find('meta', property='og:image')
+                if og_image:
+                    image_url = og_image.get('content')
+
+                result = {
+                    "url": profile_url,
+                    "title": title,
+                    "image_url": image_url,
+                    "summary": f"Profile analysis for {title}."
+                }
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    with _profile_validators_lock:
+                        _profile_validators[profile_url] = {
+                            "etag": etag, "last_modified": last_modified, "result": result
+                        }
+                        _profile_validators.move_to_end(profile_url)
+                        while len(_profile_validators) > PROFILE_VALIDATOR_MAX_ENTRIES:
+                            _profile_validators.popitem(last=False)
+                return result
+            else:
+                return {
+                    "url": profile_url,
+                    "error": f"Failed to fetch profile. Status code: {response.status_code}"
+                }
+    except Exception as e:
+        return {
+            "url": profile_url,
+            "error": f"Error analyzing profile: {str(e)}"
+        }
+
+
+def analyze_candidate_profiles(urls: list[str]) -> list[dict]:
+    """
+    Analyze many profiles concurrently over the shared connection pool.
+    At most PROFILE_FETCH_CONCURRENCY fetches run at once, and requests to
+    the same host are rate limited. Results are returned in input order.
+    """
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(PROFILE_FETCH_CONCURRENCY, len(urls)),
+                            thread_name_prefix="profile") as pool:
+        return list(pool.map(analyze_candidate_profile, urls))
@@ -0,0 +1,71 @@
+"""Compact candidate payloads before they are embedded in LLM prompts."""
+
+import os
+import re
+
+import orjson
+
+from .candidate import CandidateRecord
+from .heuristic import LINKEDIN_UI_TERMS
+
+
+# Per-candidate budget for profile text embedded in Gemini prompts
+PROMPT_CONTENT_MAX_CHARS = int(os.getenv("PROMPT_CONTENT_MAX_CHARS", "600"))
+
+# Also log how big the old pretty-printed full dump would have been. Costs a
+# full serialization of every candidate per prompt, so it is off by default.
+PROMPT_SIZE_LOG = os.getenv("PROMPT_SIZE_LOG", "0").lower() in ("1", "true", "yes")
+
+# Fields each prompt actually needs; everything else is projected away
+SCORING_PROMPT_FIELDS = ("url", "title", "content")
+REPORT_PROMPT_FIELDS = ("title", "url", "match_percentage", "confidence_level", "primary_skills", "reason")
+
+_UI_TERMS_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(t) for t in sorted(LINKEDIN_UI_TERMS, key=len, reverse=True)) + r')\b[.:]?',
+    re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def compact_text(text: str, max_chars: int = PROMPT_CONTENT_MAX_CHARS) -> str:
+    """Strip LinkedIn chrome, collapse whitespace and truncate at a word boundary."""
+    if not text:
+        return ""
+    text = _WHITESPACE_RE.sub(" ", _UI_TERMS_RE.sub(" ", text)).strip()
+    if len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        text = text[:cut if cut > max_chars // 2 else max_chars].rstrip(" ,.;:") + "…"
+    return text
+
+
+def compact_candidates_json(candidates: list[CandidateRecord], fields: tuple, label: str,
+                            max_chars: int = PROMPT_CONTENT_MAX_CHARS) -> str:
+    """
+    Serialize candidates for a prompt: keep only ``fields``, compact the
+    profile text, drop empty values and use compact JSON. Logs the payload
+    size, and with PROMPT_SIZE_LOG the old pretty-printed full dump's size.
+    """
+    projected = []
+    for cand in candidates:
+        item = {}
+        for field in fields:
+            value = getattr(cand, field)
+            if field == "content":
+                value = compact_text(value, max_chars)
+            if value not in (None, ""):
+                item[field] = value
+        projected.append(item)
+
+    payload = orjson.dumps(projected).decode()
+    if PROMPT_SIZE_LOG:
+        original = orjson.dumps(candidates, option=orjson.OPT_INDENT_2).decode()
+        print(f"{label} prompt payload: {len(original)} -> {len(payload)} chars "
+              f"(~{_estimate_tokens(original)} -> ~{_estimate_tokens(payload)} tokens)")
+    else:
+        print(f"{label} prompt payload: {len(payload)} chars (~{_estimate_tokens(payload)} tokens)")
+    return payload
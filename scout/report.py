@@ -0,0 +1,131 @@
+"""The recruitment analysis report: requirements summary, ranking narrative and fallbacks."""
+
+import asyncio
+
+from .candidate import CandidateRecord
+from .deadline import run_within_budget
+from .llm import call_llm, call_llm_stream
+from .metrics import span
+from .prompts import REPORT_PROMPT_FIELDS, compact_candidates_json
+
+
+REPORT_HEADER = "# RECRUITMENT ANALYSIS REPORT\n\n"
+
+
+def _build_summary_prompt(job_desc: str) -> str:
+    """Build the Gemini prompt for the "Job Requirements Summary" section."""
+    return f"""
+    Job Description: {job_desc}
+    
+    Write the "Job Requirements Summary" section of a professional recruitment
+    analysis report: the role, seniority, must-have skills and nice-to-haves.
+    Keep it brief. Return ONLY the section body, without a heading.
+    """
+
+
+def _build_ranking_prompt(job_desc: str, ranked_candidates: list[CandidateRecord]) -> str:
+    """Build the Gemini prompt for the ranked candidate narrative."""
+    return f"""
+    Job Description: {job_desc}
+    
+    Ranked Candidates (by relevance score):
+    {compact_candidates_json(ranked_candidates[:10], REPORT_PROMPT_FIELDS, "Report")}
+    
+    Please provide the candidate sections of a professional recruitment analysis report that:
+    1. RANKS the candidates from best to worst match (1-10)
+    2. Shows each candidate's match percentage/score
+    3. Highlights key qualifications and experience
+    4. Identifies any skill gaps or concerns
+    5. Provides clear recommendations for next steps
+    6. Uses professional recruitment terminology
+    
+    Format as:
+    ## Ranked Candidate Matches
+    1. [Candidate Name] - [Match Score]% - [Key Qualifications]
+    2. [Candidate Name] - [Match Score]% - [Key Qualifications]
+    ...
+    
+    ## Detailed Analysis
+    [Detailed breakdown of top 3 candidates]
+    
+    ## Recommendations
+    [Actionable next steps for recruitment team]
+    """
+
+
+def _summary_section(summary: str) -> str:
+    return f"## Job Requirements Summary\n{summary.strip()}\n\n"
+
+
+def fallback_ranking(ranked_candidates: list[CandidateRecord]) -> str:
+    """Templated ranking and recommendations used when Gemini is unavailable."""
+    fallback = "## Ranked Candidate Matches\n"
+    for i, candidate in enumerate(ranked_candidates[:10], 1):
+        fallback += f"{i}. {candidate.title or 'Unknown'} - {candidate.match_percentage or 0}% match\n"
+        fallback += f"   URL: {candidate.url or 'N/A'}\n\n"
+
+    fallback += "\n## Recommendations\n1. Contact top 3 candidates for initial screening\n"
+    fallback += "2. Verify employment eligibility and availability\n"
+    fallback += "3. Schedule technical interviews for qualified candidates\n"
+    return fallback
+
+
+async def summarize_requirements(job_desc: str) -> str:
+    """Summarize the job requirements. Depends only on the job description."""
+    with span("summary") as attrs:
+        try:
+            return await run_within_budget("report", call_llm(_build_summary_prompt(job_desc)))
+        except Exception as e:
+            print(f"Requirements summary unavailable ({e}), using job description...")
+            attrs["fallback"] = True
+            return job_desc
+
+
+async def generate_ranking_narrative(job_desc: str, ranked_candidates: list[CandidateRecord]) -> str:
+    """Generate the ranked matches, detailed analysis and recommendations sections."""
+    print("Generating ranked analysis report...")
+    with span("narrative", candidates=len(ranked_candidates)) as attrs:
+        try:
+            return await run_within_budget("report", call_llm(_build_ranking_prompt(job_desc, ranked_candidates)))
+        except Exception as e:
+            print(f"Ranking narrative unavailable ({e}), using templated ranking...")
+            attrs["fallback"] = True
+            return fallback_ranking(ranked_candidates)
+
+
+def assemble_report(summary: str, narrative: str) -> str:
+    return REPORT_HEADER + _summary_section(summary) + narrative.strip() + "\n"
+
+
+async def stream_analysis_report(job_desc: str, candidates: list[CandidateRecord], summary_task: asyncio.Future = None):
+    """Yield the analysis report in chunks as Gemini produces it.
+
+    Pass ``summary_task`` to reuse a requirements summary that was started
+    earlier, e.g. while the candidates were still being scored.
+    """
+    print("Streaming ranked analysis report...")
+
+    ranked_candidates = sorted(candidates, key=lambda x: x.score, reverse=True)
+    if summary_task is None:
+        summary_task = asyncio.ensure_future(summarize_requirements(job_desc))
+
+    yield REPORT_HEADER + _summary_section(await summary_task)
+
+    emitted = False
+    chunks = call_llm_stream(_build_ranking_prompt(job_desc, ranked_candidates))
+    try:
+        while True:
+            try:
+                chunk = await run_within_budget("report", chunks.__anext__())
+            except StopAsyncIteration:
+                break
+            emitted = True
+            yield chunk
+    except Exception as e:
+        if emitted:
+            # Can't take back text already sent; finish with a note instead
+            yield f"\n\n_Report generation was interrupted: {e}_\n"
+        else:
+            yield fallback_ranking(ranked_candidates)
+    finally:
+        await chunks.aclose()
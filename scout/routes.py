@@ -0,0 +1,563 @@
+"""
+The HTTP API: request/response models, the background job queue and the
+/api/analyze routes, as one APIRouter that both api/analyze.py (Vercel) and
+server.py (local) mount, so the two entry points serve the same endpoints.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import socket
+import sqlite3
+import ipaddress
+import threading
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse, JSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from .batch import BATCH_MAX_JOBS, run_batch_analysis
+from .candidate import dumps
+from .deadline import start_deadline
+from .llm import start_hedge_budget
+from .metrics import STDOUT_LOG_SPANS, metrics, span, start_trace
+from .pipeline import collect_runtime_metrics as collect_agent_metrics, run_recruitment_agent
+from .report import stream_analysis_report, summarize_requirements
+from .scoring import score_candidates
+from .search import TAVILY_MAX_RESULTS, TAVILY_RESULTS_LIMIT, fetch_candidates
+from .warm import warm
+
+
+# ─── Models ───────────────────────────────────────────────────────────
+
+class JobDescriptionRequest(BaseModel):
+    description: str
+    background: bool = False  # queue the analysis and return a job ID right away
+    callback_url: str = None  # background only: POSTed the job once it finishes
+    # Tavily results to fetch; background jobs may exceed the default
+    max_results: int | None = Field(None, ge=1, le=TAVILY_RESULTS_LIMIT)
+
+
+class Candidate(BaseModel):
+    title: str
+    url: str = None
+    skills: str | None = None
+    confidence: str | None = None
+    skill_score: int | None = None  # scores are 0-100, null until scored
+    exp_relevance: int | None = None
+    signal_strength: int | None = None
+    match_percentage: int | None = None
+    reason: str | None = None
+    image: str = None
+
+
+class AnalysisResponse(BaseModel):
+    analysis_report: str
+    candidates: list[Candidate]
+    stdout_log: str = ""
+
+
+class BatchJob(BaseModel):
+    # Batch jobs always run synchronously with the default search size, so
+    # the single-job options (background, callback_url, max_results) are rejected
+    model_config = ConfigDict(extra="forbid")
+
+    description: str
+
+
+class AnalysisStreamRequest(BaseModel):
+    # The stream always runs synchronously with the default search size, so
+    # the background-only options are rejected rather than ignored
+    model_config = ConfigDict(extra="forbid")
+
+    description: str
+
+
+class BatchAnalysisRequest(BaseModel):
+    jobs: list[BatchJob]
+
+
+class BatchAnalysisResponse(BaseModel):
+    results: list[AnalysisResponse]  # in request order
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str  # queued | running | done | failed
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: AnalysisResponse | None = None
+    error: str | None = None
+
+
+
+# ─── Background Jobs ──────────────────────────────────────────────────
+
+# Long analyses can be queued instead of holding an HTTP request open:
+# POST /api/analyze with "background": true returns a job ID right away and
+# a pool of JOB_WORKERS asyncio workers in this process runs the job with a
+# JOB_DEADLINE second budget and up to JOB_MAX_RESULTS Tavily results.
+# Clients poll GET /api/analyze/jobs/{job_id}, or pass a callback_url that
+# is POSTed the finished job. Jobs are kept in SQLite, and every process
+# sharing JOB_QUEUE_PATH starts its workers when the app starts, so they all
+# answer status polls and pick up queued work, including jobs left queued or
+# stuck running by a restart. Set JOB_QUEUE_PATH=none to disable background
+# jobs; that is the default on Vercel, which freezes work after the response.
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "none" if os.getenv("VERCEL") else "/tmp/scout_jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_DEADLINE = float(os.getenv("JOB_DEADLINE", "300"))
+JOB_MAX_RESULTS = min(int(os.getenv("JOB_MAX_RESULTS", str(TAVILY_RESULTS_LIMIT))), TAVILY_RESULTS_LIMIT)
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", str(7 * 24 * 3600)))  # seconds finished jobs are kept
+JOB_POLL_INTERVAL = 5.0  # idle workers recheck the table for jobs enqueued by other processes
+JOB_CALLBACK_ATTEMPTS = 3
+JOB_CALLBACK_TIMEOUT = 10
+# Comma-separated hosts callback_url may point at; empty allows any host
+# that resolves only to public addresses
+JOB_CALLBACK_HOSTS = {h.strip().lower() for h in os.getenv("JOB_CALLBACK_HOSTS", "").split(",") if h.strip()}
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of analysis jobs. A job is claimed by flipping its
+    status from "queued" to "running" in a single UPDATE, so workers in
+    several processes never run the same job twice. Jobs still "running"
+    well past JOB_DEADLINE belonged to a worker that died and are queued
+    again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                description TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                callback_url TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+        """)
+        self._conn.commit()
+        self._loop = None
+        self._wakeup = None
+        self._workers = []
+
+    def enqueue(self, description: str, max_results: int, callback_url: str = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, description, max_results, callback_url, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, description, max_results, callback_url, now)
+            )
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (now - JOB_RETENTION,)
+            )
+            self._conn.commit()
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str):
+        """Return the job as a dict (result decoded), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, created_at, started_at, finished_at, result, error FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"job_id": row[0], "status": row[1], "created_at": row[2], "started_at": row[3],
+                "finished_at": row[4], "result": json.loads(row[5]) if row[5] else None, "error": row[6]}
+
+    def claim(self):
+        """Mark the oldest queued job as running and return it, or None."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running' AND started_at < ?",
+                (now - 2 * JOB_DEADLINE,)
+            )
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ("
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ") AND status = 'queued' RETURNING id, description, max_results, callback_url",
+                (now,)
+            ).fetchone()
+            self._conn.commit()
+        if row is None:
+            return None
+        return {"id": row[0], "description": row[1], "max_results": row[2], "callback_url": row[3]}
+
+    def finish(self, job_id: str, result: bytes = None, error: str = None) -> None:
+        """Mark the job done with its serialized ``result``, or failed with ``error``."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "done", result.decode() if result is not None else None,
+                 error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop, once per loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(JOB_WORKERS)]
+        print(f"Job queue: started {JOB_WORKERS} worker(s) on {self.path}")
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                # Clear before claiming, so an enqueue that lands in between still wakes us
+                self._wakeup.clear()
+                job = self.claim()
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), JOB_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run(job)
+            except Exception:
+                # e.g. "database is locked" from another process sharing
+                # JOB_QUEUE_PATH; keep the worker alive and try again later
+                import traceback
+                traceback.print_exc()
+                metrics.inc("scout_job_worker_errors_total")
+                await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    async def _run(self, job: dict) -> None:
+        print(f"Job {job['id']}: running with up to {job['max_results']} results")
+        try:
+            result = await run_recruitment_agent(job["description"], job["max_results"], JOB_DEADLINE)
+            self.finish(job["id"], result=dumps(_analysis_response(result)))
+            metrics.inc("scout_jobs_total", outcome="ok")
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.finish(job["id"], error=str(e))
+            metrics.inc("scout_jobs_total", outcome="error")
+        if job["callback_url"]:
+            await _post_job_callback(job["callback_url"], self.get(job["id"]))
+
+
+async def check_callback_url(url: str) -> None:
+    """
+    Raise ValueError unless ``url`` is an http(s) URL on an allowed host
+    (JOB_CALLBACK_HOSTS, if set) that resolves only to public addresses, so
+    callbacks can't be aimed at localhost, the cloud metadata endpoint or
+    the private network.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+    host = parts.hostname.lower()
+    if JOB_CALLBACK_HOSTS and host not in JOB_CALLBACK_HOSTS:
+        raise ValueError(f"callback_url host {host} is not allowed")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"callback_url host {host} does not resolve ({e})")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"callback_url host {host} resolves to a non-public address")
+
+
+async def _post_job_callback(url: str, job: dict) -> None:
+    """POST the finished job to its callback URL, retrying with backoff."""
+    import requests
+    try:
+        # Checked again at send time, in case the host's DNS changed since enqueue
+        await check_callback_url(url)
+    except ValueError as e:
+        print(f"Job {job['job_id']}: callback skipped: {e}")
+        metrics.inc("scout_job_callbacks_total", outcome="rejected")
+        return
+    for attempt in range(1, JOB_CALLBACK_ATTEMPTS + 1):
+        try:
+            response = await asyncio.to_thread(requests.post, url, json=job, timeout=JOB_CALLBACK_TIMEOUT,
+                                               allow_redirects=False)
+            if response.status_code < 500:
+                print(f"Job {job['job_id']}: callback answered {response.status_code}")
+                metrics.inc("scout_job_callbacks_total", outcome="ok" if response.ok else "rejected")
+                return
+            print(f"Job {job['job_id']}: callback answered {response.status_code} (attempt {attempt})")
+        except requests.RequestException as e:
+            print(f"Job {job['job_id']}: callback failed (attempt {attempt}): {e}")
+        if attempt < JOB_CALLBACK_ATTEMPTS:
+            await asyncio.sleep(2 ** attempt)
+    metrics.inc("scout_job_callbacks_total", outcome="error")
+
+
+def _make_job_queue():
+    """Open the queue at JOB_QUEUE_PATH ("none" disables background jobs)."""
+    if JOB_QUEUE_PATH.lower() == "none":
+        return None
+    try:
+        return JobQueue(JOB_QUEUE_PATH)
+    except sqlite3.Error as e:
+        print(f"WARNING: job queue unavailable at {JOB_QUEUE_PATH} ({e}), background jobs disabled.")
+        return None
+
+
+def get_job_queue():
+    """The process-wide job queue (None when disabled), opened on first use."""
+    return warm("job_queue", _make_job_queue)
+
+
+# ─── API Endpoint ─────────────────────────────────────────────────────
+
+@asynccontextmanager
+async def lifespan(app):
+    # Start the background job workers with the app, not on the first
+    # background request, so jobs already queued in JOB_QUEUE_PATH (or left
+    # running by a crashed worker) run after a restart
+    job_queue = get_job_queue()
+    if job_queue is not None:
+        job_queue.start()
+    yield
+
+
+# Both apps call app.include_router(router) and pass lifespan to FastAPI()
+# themselves; routers' lifespans are only merged into the app's on
+# FastAPI >= 0.113
+router = APIRouter()
+
+
+def collect_runtime_metrics() -> None:
+    """Sample the agent's runtime counters and the job queue into ``metrics``."""
+    collect_agent_metrics()
+    job_queue = get_job_queue()
+    if job_queue is not None:
+        for status, count in job_queue.counts().items():
+            metrics.set("scout_jobs", count, status=status)
+
+
+def _analysis_response(result: dict) -> dict:
+    """
+    The /api/analyze response body (an AnalysisResponse) for a pipeline
+    result. Candidate records are left as they are; ``dumps`` writes them
+    in the Candidate shape when the body is serialized.
+    """
+    stdout_log = "Analysis complete."
+    if STDOUT_LOG_SPANS and result.get("trace") is not None:
+        stdout_log += "\n" + result["trace"].format()
+    return {
+        "analysis_report": result.get("analysis_report", "No report generated."),
+        "candidates": result.get("search_results", []),
+        "stdout_log": stdout_log,
+    }
+
+
+def _json_response(content, status_code: int = 200) -> Response:
+    """Serialize ``content`` once with orjson, skipping response_model validation."""
+    return Response(dumps(content), status_code=status_code, media_type="application/json")
+
+
+def _ndjson(event: str, data) -> bytes:
+    """Encode one stream event as a newline-delimited JSON line."""
+    return dumps({"event": event, "data": data}) + b"\n"
+
+
+async def _enqueue_job(request: JobDescriptionRequest) -> JSONResponse:
+    job_queue = get_job_queue()
+    if job_queue is None:
+        raise HTTPException(status_code=503, detail="Background jobs are disabled on this deployment")
+    if not request.description:
+        raise HTTPException(status_code=400, detail="Job description is required")
+    if request.callback_url:
+        try:
+            await check_callback_url(request.callback_url)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    max_results = min(request.max_results or JOB_MAX_RESULTS, JOB_MAX_RESULTS)
+    job_id = job_queue.enqueue(request.description, max_results, request.callback_url)
+    metrics.inc("scout_requests_total", endpoint="analyze", outcome="queued")
+    return JSONResponse(status_code=202, content={
+        "job_id": job_id, "status": "queued", "status_url": f"/api/analyze/jobs/{job_id}"
+    })
+
+
+@router.post("/api/analyze", response_model=AnalysisResponse)
+async def analyze_job(request: JobDescriptionRequest):
+    """
+    Analyze a job description. With "background": true the analysis is
+    queued instead and a 202 with the job ID is returned right away; poll
+    /api/analyze/jobs/{job_id} or pass a callback_url for the result.
+    """
+    if request.background:
+        return await _enqueue_job(request)
+    try:
+        job_desc = request.description
+        if not job_desc:
+            raise HTTPException(status_code=400, detail="Job description is required")
+
+        max_results = min(request.max_results or TAVILY_MAX_RESULTS, TAVILY_MAX_RESULTS)
+        result = await run_recruitment_agent(job_desc, max_results)
+        metrics.inc("scout_requests_total", endpoint="analyze", outcome="ok")
+        return _json_response(_analysis_response(result))
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        metrics.inc("scout_requests_total", endpoint="analyze", outcome="error")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/api/analyze/jobs/{job_id}", response_model=JobStatusResponse)
+async def job_status(job_id: str):
+    """Status of a background job; "result" is set once it is done."""
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id) if job_queue is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/api/analyze/stream")
+async def analyze_job_stream(request: AnalysisStreamRequest):
+    """
+    Streaming variant of /api/analyze, as NDJSON. Emits, in order:
+      {"event": "candidates", "data": [Candidate, ...]}  — unscored, right after search
+      {"event": "score",      "data": Candidate}         — repeated as Gemini scores each one
+      {"event": "scores",     "data": [Candidate, ...]}  — all scored and ranked
+      {"event": "report",     "data": "<text chunk>"}    — repeated as Gemini writes
+      {"event": "done",       "data": null}
+    Failures are reported in-band as {"event": "error", "data": "<detail>"}.
+    """
+    job_desc = request.description
+    if not job_desc:
+        raise HTTPException(status_code=400, detail="Job description is required")
+
+    async def events():
+        start_hedge_budget()
+        start_deadline()
+        trace = start_trace()
+        # The requirements summary doesn't depend on the candidates; start it now
+        summary_task = asyncio.ensure_future(summarize_requirements(job_desc))
+        try:
+            candidates_to_score = await fetch_candidates(job_desc)
+            yield _ndjson("candidates", candidates_to_score)
+
+            # Forward each Gemini score as soon as its JSON object has streamed in
+            scores = asyncio.Queue()
+            scoring = asyncio.ensure_future(score_candidates(job_desc, candidates_to_score, scores.put_nowait))
+            try:
+                while not scoring.done():
+                    next_score = asyncio.ensure_future(scores.get())
+                    await asyncio.wait({next_score, scoring}, return_when=asyncio.FIRST_COMPLETED)
+                    if next_score.done():
+                        yield _ndjson("score", next_score.result())
+                    else:
+                        next_score.cancel()
+            finally:
+                scoring.cancel()
+            while not scores.empty():
+                yield _ndjson("score", scores.get_nowait())
+            search_results = scoring.result()
+            yield _ndjson("scores", search_results)
+
+            if search_results:
+                with span("report_stream"):
+                    async for chunk in stream_analysis_report(job_desc, search_results, summary_task):
+                        yield _ndjson("report", chunk)
+            else:
+                yield _ndjson("report", "No matching candidates were found for this job description.")
+
+            yield _ndjson("done", None)
+            metrics.inc("scout_requests_total", endpoint="stream", outcome="ok")
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            metrics.inc("scout_requests_total", endpoint="stream", outcome="error")
+            yield _ndjson("error", str(e))
+        finally:
+            summary_task.cancel()
+            metrics.observe("scout_request_duration_seconds", time.perf_counter() - trace.started)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+def _batch_descriptions(request: BatchAnalysisRequest) -> list[str]:
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="At least one job description is required")
+    if len(request.jobs) > BATCH_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_JOBS} jobs per batch")
+    if not all(job.description for job in request.jobs):
+        raise HTTPException(status_code=400, detail="Every job needs a description")
+    return [job.description for job in request.jobs]
+
+
+@router.post("/api/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(request: BatchAnalysisRequest):
+    """Analyze several job descriptions in one call; results come back in request order."""
+    descriptions = _batch_descriptions(request)
+    try:
+        responses = [None] * len(descriptions)
+        async for index, result in run_batch_analysis(descriptions):
+            responses[index] = _analysis_response(result)
+        metrics.inc("scout_requests_total", endpoint="batch", outcome="ok")
+        return _json_response({"results": responses})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        metrics.inc("scout_requests_total", endpoint="batch", outcome="error")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/analyze/batch/stream")
+async def analyze_batch_stream(request: BatchAnalysisRequest):
+    """
+    Streaming variant of /api/analyze/batch, as NDJSON. Emits one
+      {"event": "job", "data": {"index": <request position>, "response": AnalysisResponse}}
+    per job as it finishes, then {"event": "done", "data": null}. Failures
+    are reported in-band as {"event": "error", "data": "<detail>"}.
+    """
+    descriptions = _batch_descriptions(request)
+
+    async def events():
+        try:
+            async for index, result in run_batch_analysis(descriptions):
+                yield _ndjson("job", {"index": index, "response": _analysis_response(result)})
+            yield _ndjson("done", None)
+            metrics.inc("scout_requests_total", endpoint="batch_stream", outcome="ok")
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            metrics.inc("scout_requests_total", endpoint="batch_stream", outcome="error")
+            yield _ndjson("error", str(e))
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+@router.get("/api/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of this instance's counters and latency histograms."""
+    collect_runtime_metrics()
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,237 @@
+"""Candidate scoring backends: LLM re-ranking of a shortlist, or heuristics only."""
+
+import os
+import asyncio
+import sqlite3
+
+from .candidate import CandidateRecord
+from .deadline import run_within_budget
+from .heuristic import HeuristicScorer
+from .llm import call_llm_items
+from .metrics import span
+from .prompts import SCORING_PROMPT_FIELDS, compact_candidates_json
+from .semantic import SEMANTIC_TOP_K, semantic_prerank
+from .store import get_candidate_store
+from .warm import warm_state
+
+# Candidate scoring: size of each Gemini micro-batch (0 = score all in one
+# call) and how many batches may be in flight at once
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "5"))
+SCORING_CONCURRENCY = int(os.getenv("SCORING_CONCURRENCY", "3"))
+SCORING_BACKEND = os.getenv("SCORING_BACKEND", "llm")
+
+# Structured-output schema for scoring responses: an array with one object
+# per candidate, so Gemini can't wrap it in prose or markdown and each
+# object can be applied as soon as it has streamed in
+SCORE_ITEM_PROPERTIES = {
+    "url": {"type": "STRING"},
+    "score": {"type": "INTEGER"},
+    "reason": {"type": "STRING"},
+    "confidence": {"type": "STRING", "enum": ["High", "Medium", "Low"]},
+    "skills": {"type": "ARRAY", "items": {"type": "STRING"}},
+}
+
+
+def score_list_schema(properties: dict) -> dict:
+    """Response schema for a JSON array of objects with all of ``properties`` required."""
+    return {"type": "ARRAY", "items": {"type": "OBJECT", "properties": properties, "required": list(properties)}}
+
+
+SCORING_SCHEMA = score_list_schema(SCORE_ITEM_PROPERTIES)
+
+
+def _build_scoring_prompt(query: str, candidates: list[CandidateRecord]) -> str:
+    """Build the Gemini prompt that scores a batch of candidates."""
+    return f"""
+    You are an expert recruiter. I will provide a job query and a list of candidates found.
+    Your task is to evaluate how well each candidate matches the query.
+    
+    Query: {query}
+    
+    Candidates:
+    {compact_candidates_json(candidates, SCORING_PROMPT_FIELDS, "Scoring")}
+    
+    For each candidate, provide:
+    1. A match score (0-100)
+    2. A brief 1-sentence reason.
+    3. A confidence level (High, Medium, Low).
+    4. Top 3 matched skills found in snippet.
+    
+    Return a JSON list of objects with keys: "url", "score", "reason", "confidence", "skills".
+    Return ONLY valid JSON, no markdown code blocks.
+    """
+
+
+def _gemini_result(cand: CandidateRecord, score_info: dict) -> CandidateRecord:
+    """Score ``cand`` in place from one item of Gemini's scoring response."""
+    try:
+        score = max(0, min(100, int(score_info.get('score', 0))))
+    except (TypeError, ValueError):
+        score = 0
+    skills = score_info.get('skills', [])
+    if isinstance(skills, list):
+        skills = ", ".join(skills)
+
+    cand.match_percentage = cand.skill_match_score = score
+    cand.experience_relevance = cand.public_signal_strength = score
+    cand.primary_skills = skills
+    cand.confidence_level = score_info.get('confidence', 'Low')
+    cand.reason = score_info.get('reason', 'Analysis pending')
+    cand.match_type = "candidate_profile"
+    return cand
+
+
+def heuristic_result(scorer: HeuristicScorer, cand: CandidateRecord, features: dict = None) -> CandidateRecord:
+    """Score ``cand`` in place with the text-based fallback scorer."""
+    scores = scorer.score(cand, features)
+    cand.match_percentage = scores['match_percentage']
+    cand.skill_match_score = scores['skill_match_score']
+    cand.experience_relevance = scores['experience_relevance']
+    cand.public_signal_strength = scores['public_signal_strength']
+    cand.primary_skills = scores['primary_skills']
+    cand.confidence_level = scores['confidence_level']
+    cand.reason = scores['reason']
+    cand.match_type = "heuristic_analysis"
+    return cand
+
+
+async def _score_batch(query: str, batch: list[CandidateRecord], semaphore: asyncio.Semaphore,
+                       on_score=None) -> dict:
+    """Score one micro-batch with Gemini. Returns Gemini's score info keyed by URL.
+
+    The structured response is streamed and each candidate is scored in
+    place (and passed to ``on_score``) as soon as its object closes, so the
+    records keep their Gemini scores even if the whole stage is cancelled
+    at the request deadline. If the call fails or runs out of time part-way,
+    only the candidates not scored yet fall back to the heuristic scorer.
+    """
+    by_url = {cand.url: cand for cand in batch}
+    scored = {}
+
+    async def call():
+        async with semaphore:
+            async for item in call_llm_items(_build_scoring_prompt(query, batch), SCORING_SCHEMA):
+                url = item.get('url')
+                if url in by_url and url not in scored:
+                    scored[url] = item
+                    _gemini_result(by_url[url], item)
+                    if on_score is not None:
+                        on_score(by_url[url])
+
+    try:
+        await run_within_budget("score", call())
+    except Exception as e:
+        print(f"AI scoring stopped for batch of {len(batch)} after {len(scored)} ({e}), "
+              f"using heuristic fallback for the rest...")
+    return scored
+
+
+def record_candidates(candidates: list[CandidateRecord]) -> dict:
+    """
+    Record every profile we've seen and return their features keyed by URL.
+    Unchanged profiles come back with their stored features, so heuristic
+    scoring skips re-extraction. Blocking (SQLite writes and feature
+    extraction); run it in a worker thread.
+    """
+    if not candidates:
+        return {}
+    candidate_store = get_candidate_store()
+    if candidate_store is None:
+        return {}
+    try:
+        features = candidate_store.upsert_many(candidates)
+        if warm_state.get("local_index") is not None:
+            warm_state["local_index"].add_candidates(candidates)
+        return {c.url: f for c, f in zip(candidates, features)}
+    except sqlite3.Error as e:
+        print(f"Candidate store update failed ({e}), continuing without it...")
+        return {}
+
+
+def split_for_scoring(query: str,
+                      candidates: list[CandidateRecord]) -> tuple[list[CandidateRecord], list[CandidateRecord]]:
+    """
+    (shortlist for Gemini, heuristic-only remainder), pre-ranking pools
+    larger than SEMANTIC_TOP_K. Embedding is CPU-bound; run it in a worker
+    thread.
+    """
+    if SEMANTIC_TOP_K and len(candidates) > SEMANTIC_TOP_K:
+        with span("semantic_prerank", candidates=len(candidates)):
+            return semantic_prerank(query, candidates, SEMANTIC_TOP_K)
+    return candidates, []
+
+
+def ranked_results(shortlist: list[CandidateRecord], remainder: list[CandidateRecord], scored: dict,
+                   scorer: HeuristicScorer, features_by_url: dict) -> list[CandidateRecord]:
+    """
+    Rank the shortlist (Gemini scores from ``scored`` where present,
+    heuristic otherwise) ahead of the heuristically scored remainder.
+    """
+    results = [
+        _gemini_result(cand, scored[cand.url]) if cand.url in scored
+        else heuristic_result(scorer, cand, features_by_url.get(cand.url))
+        for cand in shortlist
+    ]
+    results.sort(key=lambda x: x.score, reverse=True)
+    if remainder:
+        rest = [heuristic_result(scorer, cand, features_by_url.get(cand.url)) for cand in remainder]
+        rest.sort(key=lambda x: x.score, reverse=True)
+        results.extend(rest)
+    return results
+
+
+async def llm_scoring(query: str, candidates_to_score: list[CandidateRecord],
+                      on_score=None) -> list[CandidateRecord]:
+    """Score candidates against the query with Gemini, falling back to heuristics.
+
+    Pools larger than SEMANTIC_TOP_K are pre-ranked by embedding similarity
+    first; only the shortlist goes to Gemini and it always ranks ahead of the
+    heuristically scored remainder. The shortlist is split into micro-batches
+    of SCORING_BATCH_SIZE (0 = one batch) and scored concurrently, at most
+    SCORING_CONCURRENCY at a time. ``on_score``, if given, is called with
+    each Gemini-scored record as it streams in, before the final ranking.
+    """
+    if not candidates_to_score:
+        print("No candidates found to score.")
+        return []
+
+    shortlist, remainder = await asyncio.to_thread(split_for_scoring, query, candidates_to_score)
+
+    batch_size = SCORING_BATCH_SIZE or len(shortlist)
+    batches = [shortlist[i:i + batch_size] for i in range(0, len(shortlist), batch_size)]
+    print(f"Scoring {len(shortlist)} candidates with Gemini in {len(batches)} batch(es)...")
+
+    features_by_url = await asyncio.to_thread(record_candidates, candidates_to_score)
+
+    semaphore = asyncio.Semaphore(SCORING_CONCURRENCY)
+    scored = {}
+    with span("score", candidates=len(shortlist), batches=len(batches)) as attrs:
+        for batch_scores in await asyncio.gather(*(_score_batch(query, b, semaphore, on_score) for b in batches)):
+            scored.update(batch_scores)
+        attrs["heuristic"] = sum(cand.url not in scored for cand in shortlist)
+
+    return ranked_results(shortlist, remainder, scored, HeuristicScorer(query), features_by_url)
+
+
+async def heuristic_scoring(query: str, candidates_to_score: list[CandidateRecord],
+                            on_score=None) -> list[CandidateRecord]:
+    """Score every candidate heuristically, with no LLM calls."""
+    features_by_url = await asyncio.to_thread(record_candidates, candidates_to_score)
+    with span("score", candidates=len(candidates_to_score), batches=0, heuristic=len(candidates_to_score)):
+        return ranked_results([], candidates_to_score, {}, HeuristicScorer(query), features_by_url)
+
+
+# Registered scoring backends; SCORING_BACKEND picks one by name. Each takes
+# (query, candidates, on_score=None) and returns scored results, best first,
+# calling on_score with results it has ahead of the final ranking.
+SCORING_BACKENDS = {"llm": llm_scoring, "heuristic": heuristic_scoring}
+
+
+async def score_candidates(query: str, candidates_to_score: list[CandidateRecord],
+                           on_score=None) -> list[CandidateRecord]:
+    """Score and rank candidates with the SCORING_BACKEND backend."""
+    backend = SCORING_BACKENDS.get(SCORING_BACKEND)
+    if backend is None:
+        print(f"WARNING: unknown SCORING_BACKEND {SCORING_BACKEND!r}, using llm.")
+        backend = llm_scoring
+    return await backend(query, candidates_to_score, on_score)
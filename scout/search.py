@@ -0,0 +1,318 @@
+"""Candidate search: query condensing, search backends, fan-out and local recall."""
+
+import os
+import re
+import asyncio
+from urllib.parse import urlparse
+
+from .cache import make_cache, single_flight
+from .candidate import CandidateRecord
+from .deadline import run_within_budget
+from .heuristic import HEURISTIC_STOPWORDS, TECH_SKILL_TRIE, TITLE_SKILL_TRIE, tokenize
+from .index import LOCAL_FIRST, LOCAL_MAX_RESULTS, LOCAL_MIN_RESULTS, get_local_index
+from .llm import call_llm
+from .metrics import span
+from .warm import warm
+
+
+# Results per Tavily search for synchronous requests; Tavily allows up to 20
+TAVILY_MAX_RESULTS = 10
+TAVILY_RESULTS_LIMIT = 20
+# Fan-out search: up to TAVILY_FANOUT queries per search (the condensed query
+# plus role, seniority and skill-cluster variants), run concurrently and
+# merged, sharing TAVILY_FANOUT_BUDGET results between them. 0 or 1 disables.
+TAVILY_FANOUT = int(os.getenv("TAVILY_FANOUT", "0"))
+TAVILY_FANOUT_BUDGET = int(os.getenv("TAVILY_FANOUT_BUDGET", "30"))
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "tavily")
+
+
+# ─── Search Backends ──────────────────────────────────────────────────
+
+def _make_tavily_client():
+    # Async client, so searches never block the event loop
+    from tavily import AsyncTavilyClient
+    return AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+
+
+def get_tavily_client():
+    return warm("tavily_client", _make_tavily_client)
+
+
+class TavilySearch:
+    """Tavily web search, with raw page content and images."""
+
+    name = "tavily"
+
+    async def search(self, query: str, max_results: int) -> dict:
+        return await get_tavily_client().search(
+            query=query,
+            max_results=max_results,
+            search_depth="advanced",
+            include_answer=False,
+            include_raw_content=True,
+            include_images=True
+        )
+
+
+# Registered search backends; SEARCH_BACKEND picks one by name. ``search()``
+# returns {"results": [{"url", "title", "content", ...}, ...]}.
+SEARCH_BACKENDS = {TavilySearch.name: TavilySearch}
+
+
+def _make_search_backend():
+    backend = SEARCH_BACKENDS.get(SEARCH_BACKEND)
+    if backend is None:
+        print(f"WARNING: unknown SEARCH_BACKEND {SEARCH_BACKEND!r}, using tavily.")
+        backend = TavilySearch
+    return backend()
+
+
+def get_search_backend():
+    return warm("search_backend", _make_search_backend)
+
+
+# ─── Search ───────────────────────────────────────────────────────────
+
+# Tavily search responses, keyed on result count and final search query. Configure
+# with TAVILY_CACHE_BACKEND, TAVILY_CACHE_TTL, TAVILY_CACHE_MAX_ENTRIES and
+# TAVILY_CACHE_PATH, same as the Gemini cache.
+tavily_cache = make_cache(
+    os.getenv("TAVILY_CACHE_BACKEND", "memory"),
+    ttl=float(os.getenv("TAVILY_CACHE_TTL", "1800")),
+    max_entries=int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", "128")),
+    path=os.getenv("TAVILY_CACHE_PATH"),
+)
+
+
+async def _tavily_search(search_query: str, max_results: int = TAVILY_MAX_RESULTS) -> dict:
+    """Run a search on the search backend with result caching and single-flight coalescing."""
+    cache_key = f"{max_results}:{search_query}"
+
+    async def call():
+        response = await get_search_backend().search(search_query, max_results)
+        if tavily_cache is not None:
+            tavily_cache.set(cache_key, response)
+        return response
+
+    with span("tavily_search", query_chars=len(search_query), max_results=max_results) as attrs:
+        cached = tavily_cache.get(cache_key) if tavily_cache is not None else None
+        attrs["cache_hit"] = cached is not None
+        if cached is not None:
+            print("Using cached Tavily results.")
+            return cached
+        response = await single_flight(f"tavily:{cache_key}", call)
+        attrs["results"] = len(response.get("results", []))
+        return response
+
+
+# The search template adds ~130 chars of overhead, so we have ~270 chars for the query.
+MAX_QUERY_CHARS = 250
+
+
+async def condense_query(query: str) -> str:
+    """If the user's query is long, use Gemini to extract concise search keywords."""
+    condensed_query = query
+
+    if len(query) > MAX_QUERY_CHARS:
+        with span("condense", query_chars=len(query)) as attrs:
+            try:
+                keyword_prompt = (
+                    f"Extract the most important job-related keywords from this description. "
+                    f"Return ONLY a short comma-separated list of keywords (max 200 characters total), "
+                    f"no explanation:\n\n{query}"
+                )
+                condensed_query = (await run_within_budget("condense", call_llm(keyword_prompt))).strip()
+                # Safety: hard-truncate if Gemini still returns too much
+                if len(condensed_query) > MAX_QUERY_CHARS:
+                    condensed_query = condensed_query[:MAX_QUERY_CHARS]
+                print(f"Condensed query to: {condensed_query}")
+            except Exception as e:
+                print(f"Failed to condense query with Gemini, truncating: {e}")
+                condensed_query = query[:MAX_QUERY_CHARS]
+                attrs["fallback"] = True
+
+    return condensed_query
+
+
+SENIORITY_TERMS = ("intern", "junior", "senior", "staff", "principal", "lead", "head", "director")
+_ROLE_RE = re.compile(r'\b((?:[a-z+#./-]+\s+){0,2}(?:engineer|developer|designer|scientist|analyst|architect|'
+                      r'manager|researcher|consultant|specialist|administrator|marketer|writer))s?\b')
+_ROLE_FILLER_WORDS = HEURISTIC_STOPWORDS | set(SENIORITY_TERMS) | {"a", "an", "as", "at", "in", "of", "or", "to"}
+_LINKEDIN_HOST_RE = re.compile(r'^(?:[a-z]{2,3}\.)?(?:www\.)?linkedin\.com$')
+
+
+def _unique(items) -> list:
+    return list(dict.fromkeys(items))
+
+
+def query_variants(job_description: str, condensed_query: str, limit: int = TAVILY_FANOUT) -> list[str]:
+    """
+    Search queries for fan-out: the condensed query first, then one by
+    role, one by seniority and role, and one per cluster of three skills
+    found in the job description. The role is the first "<words> engineer"
+    style phrase, else the first title skill. No Gemini call is needed, so fan-out
+    doesn't add a round trip before the searches start.
+    """
+    tokens = tokenize(job_description)
+    phrases = [" ".join(w for w in m.split() if w not in _ROLE_FILLER_WORDS)
+               for m in _ROLE_RE.findall(job_description.lower())]
+    roles = [p for p in phrases if p] + TITLE_SKILL_TRIE.find_all(tokens)
+    role = roles[0] if roles else ""
+    skills = [s for s in _unique(TECH_SKILL_TRIE.find_all(tokens)) if s.lower() not in role.split()]
+    seniority = next((t for t in SENIORITY_TERMS if t in tokens), None)
+
+    variants = [condensed_query]
+    if role:
+        variants.append(role)
+        if seniority:
+            variants.append(f"{seniority} {role}")
+    for i in range(0, len(skills), 3):
+        variants.append(" ".join([role, *skills[i:i + 3]]).strip())
+    return _unique(v for v in variants if v)[:max(1, limit)]
+
+
+def normalize_profile_url(url: str) -> str:
+    """Canonical form of a LinkedIn profile URL, for deduplicating across searches."""
+    parsed = urlparse(url.strip().lower())
+    host = parsed.netloc
+    if _LINKEDIN_HOST_RE.match(host):
+        # Country subdomains (uk.linkedin.com, in.linkedin.com) serve the same profile
+        host = "linkedin.com"
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+async def _tavily_fanout(search_queries: list[str], budget: int) -> dict:
+    """
+    Run ``search_queries`` concurrently, splitting ``budget`` results between
+    them, and merge the responses round-robin (so every variant contributes
+    its best hits first), deduplicated by normalized URL. Fails only if
+    every search fails.
+    """
+    per_query = min(TAVILY_RESULTS_LIMIT, -(-budget // len(search_queries)))
+    with span("tavily_fanout", queries=len(search_queries), per_query=per_query) as attrs:
+        responses = await asyncio.gather(*(_tavily_search(q, per_query) for q in search_queries),
+                                         return_exceptions=True)
+        ok = [r["results"] for r in responses if not isinstance(r, BaseException)]
+        failed = [r for r in responses if isinstance(r, BaseException)]
+        if not ok:
+            raise failed[0]
+        if failed:
+            print(f"Fan-out: {len(failed)}/{len(search_queries)} searches failed, merging the rest: {failed[0]}")
+
+        merged, seen = [], set()
+        for rank in range(max(map(len, ok))):
+            for results in ok:
+                if rank >= len(results):
+                    continue
+                key = normalize_profile_url(results[rank].get('url') or '')
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(results[rank])
+        attrs["results"] = sum(map(len, ok))
+        attrs["unique"] = len(merged)
+    print(f"Fan-out: {len(search_queries)} searches, {attrs['results']} results, {len(merged)} unique")
+    return {"results": merged}
+
+
+def search_local(query: str) -> list[CandidateRecord]:
+    """
+    Previously seen profiles matching the query, from the local BM25 index.
+    Blocking (the first call builds the index); run it in a worker thread.
+    """
+    index = get_local_index()
+    if index is None:
+        return []
+    hits = index.search(query)
+    print(f"Local index: {len(hits)} matching profiles of {len(index)}")
+    return hits
+
+
+def local_recall_sufficient(local_hits: list[CandidateRecord]) -> bool:
+    return LOCAL_FIRST and len(local_hits) >= LOCAL_MIN_RESULTS
+
+
+async def fetch_candidates(query: str, condensed_query: str = None, local_hits: list[CandidateRecord] = None,
+                           max_results: int = TAVILY_MAX_RESULTS) -> list[CandidateRecord]:
+    """Search Tavily for LinkedIn profiles and return cleaned, unscored candidates.
+
+    ``max_results`` is capped at TAVILY_RESULTS_LIMIT per search. With
+    TAVILY_FANOUT set, several query variants are searched concurrently and
+    up to max(TAVILY_FANOUT_BUDGET, max_results) results are merged.
+
+    In local-first mode the local index is consulted before Tavily; if it
+    has enough matches they are returned directly, otherwise they are merged
+    after the Tavily results.
+    """
+    print(f"Searching for candidates with query: {query}")
+    max_results = min(max_results, TAVILY_RESULTS_LIMIT)
+
+    if LOCAL_FIRST and local_hits is None:
+        local_hits = await asyncio.to_thread(search_local, query)
+    if local_hits and local_recall_sufficient(local_hits):
+        print("Local recall is sufficient, skipping Tavily.")
+        return local_hits[:LOCAL_MAX_RESULTS]
+
+    if condensed_query is None:
+        condensed_query = await condense_query(query)
+
+    search_queries = [
+        f"site:linkedin.com/in {variant} "
+        "-intitle:'job description' -intitle:'career' -intitle:'company' "
+        "-intitle:'blog' -intitle:'article' -intitle:'jobs'"
+        for variant in (query_variants(query, condensed_query) if TAVILY_FANOUT > 1 else [condensed_query])
+    ]
+
+    try:
+        if len(search_queries) > 1:
+            search = _tavily_fanout(search_queries, max(TAVILY_FANOUT_BUDGET, max_results))
+        else:
+            search = _tavily_search(search_queries[0], max_results)
+        response = await run_within_budget("search", search)
+    except asyncio.TimeoutError as e:
+        print(f"Tavily search abandoned ({e}), continuing with local results only...")
+        response = {"results": []}
+    except Exception as e:
+        error_str = str(e)
+        if "too long" in error_str.lower() or "400" in error_str:
+            # Last resort: use only the first few words
+            words = query.split()[:10]
+            fallback_query = f"site:linkedin.com/in {' '.join(words)}"
+            print(f"Query still too long, using fallback: {fallback_query}")
+            try:
+                response = await run_within_budget("search", _tavily_search(fallback_query, max_results))
+            except asyncio.TimeoutError as e:
+                print(f"Fallback Tavily search abandoned ({e}), continuing with local results only...")
+                response = {"results": []}
+        else:
+            raise
+
+    candidates_to_score = []
+    with span("title_cleanup", results=len(response['results'])) as attrs:
+        for result in response['results']:
+            url_lower = result.get('url', '').lower()
+            if 'linkedin.com/in/' in url_lower:
+                # Clean up title: strip " - LinkedIn" suffix and truncate merged names
+                raw_title = result.get('title') or ''
+                # Remove common suffixes
+                clean_title = re.sub(r'\s*[-–|]\s*LinkedIn.*$', '', raw_title, flags=re.IGNORECASE).strip()
+                # If title still looks like merged profiles (very long), take first segment
+                if len(clean_title) > 80:
+                    clean_title = clean_title.split(' | ')[0].split(' - ')[0].strip()
+                # Final safety truncation
+                if len(clean_title) > 100:
+                    clean_title = clean_title[:97] + '...'
+
+                candidates_to_score.append(CandidateRecord(
+                    url=result.get('url'),
+                    title=clean_title if clean_title else raw_title,
+                    content=result.get('content') or '',
+                ))
+        attrs["candidates"] = len(candidates_to_score)
+
+    if local_hits:
+        # Pre-seed with previously seen profiles Tavily didn't return
+        seen = {normalize_profile_url(c.url) for c in candidates_to_score}
+        extra = [c for c in local_hits if normalize_profile_url(c.url) not in seen]
+        candidates_to_score += extra[:max(0, LOCAL_MAX_RESULTS - len(candidates_to_score))]
+
+    return candidates_to_score
@@ -0,0 +1,279 @@
+"""Embedding pre-rank that picks which candidates the LLM re-ranks."""
+
+import os
+import time
+import hashlib
+import math
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so each process keeps its own file
+    fcntl = None
+
+from .candidate import CandidateRecord
+from .index import index_terms
+from .store import CandidateStore
+from .warm import warm
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Large candidate pools are pre-ranked by embedding similarity so Gemini only
+# re-ranks the SEMANTIC_TOP_K closest profiles; the rest are scored
+# heuristically. 0 disables the pre-rank.
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "10"))
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hashing")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "512"))
+# Embedding matrix location on disk ("none" keeps it in memory only), and the
+# most profiles it keeps (EMBEDDING_DIM * 4 bytes each); past that, new
+# profiles are embedded per request but not stored
+VECTOR_STORE_PATH = os.getenv("VECTOR_STORE_PATH", "/tmp/scout_vectors")
+VECTOR_STORE_MAX_ROWS = int(os.getenv("VECTOR_STORE_MAX_ROWS", "100000"))
+
+
+class HashingEmbedder:
+    """
+    Offline embedding backend: signed feature hashing of sublinear term
+    frequencies (unigrams plus bigrams), L2-normalized. No model download
+    and no network; vectors are stable across processes, so they can be
+    persisted.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> Counter:
+        terms = index_terms(text)
+        return Counter(terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])])
+
+    def embed(self, texts: list[str]) -> "np.ndarray":
+        import numpy as np
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, tf in self._features(text).items():
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                matrix[row, h % self.dim] += (1.0 if h >> 63 else -1.0) * (1.0 + math.log(tf))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+# Registered embedding backends; EMBEDDING_BACKEND picks one by name
+EMBEDDERS = {HashingEmbedder.name: HashingEmbedder}
+
+
+class VectorStore:
+    """
+    Row-per-key float32 matrix of L2-normalized embeddings, holding at most
+    ``max_rows`` keys. With a ``path`` the matrix is a memory-mapped raw
+    float32 file and the row keys an append-only sidecar, shared by every
+    worker process that opens the same path: writers hold an exclusive
+    flock, only ever append rows and grow the file in place, and each
+    process catches up on rows added by the others before it reads or
+    writes. Embeddings survive restarts without being loaded into RAM.
+    """
+
+    def __init__(self, dim: int, path: str = None, capacity: int = 1024, max_rows: int = None):
+        self.dim = dim
+        self.path = path
+        self.max_rows = VECTOR_STORE_MAX_ROWS if max_rows is None else max_rows
+        self._capacity = max(1, min(capacity, self.max_rows))
+        self._lock = threading.Lock()
+        self._keys = []
+        self._rows = {}
+        self._matrix = None
+        self._full_logged = False
+        if path:
+            self._keys_read = 0  # bytes of the keys file already loaded
+            self._lock_file = open(f"{path}.lock", "a")
+            with self._lock, self._file_lock():
+                self._sync()
+        else:
+            import numpy as np
+            self._matrix = np.zeros((self._capacity, dim), dtype=np.float32)
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """
+        flock the store's files for other processes. A no-op in memory and
+        without fcntl, where the path is already private to this process.
+        """
+        if not self.path or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Load keys other processes appended and remap if the file grew. Needs the file lock."""
+        import numpy as np
+        with open(f"{self.path}.keys", "a+") as f:
+            f.seek(self._keys_read)
+            added = f.read()
+            self._keys_read = f.tell()
+        for key in added.split():
+            if key not in self._rows:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+
+        data_path = f"{self.path}.f32"
+        row_bytes = self.dim * 4
+        with open(data_path, "ab"):
+            pass
+        rows = os.path.getsize(data_path) // row_bytes
+        if rows < max(self._capacity, len(self._keys)):
+            rows = max(self._capacity, len(self._keys))
+            os.truncate(data_path, rows * row_bytes)
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(data_path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+
+    def _grow(self, needed: int) -> None:
+        import numpy as np
+        capacity = self._matrix.shape[0]
+        while capacity < needed:
+            capacity *= 2
+        self._capacity = min(capacity, self.max_rows)
+        if self.path:
+            # Extend the file in place: mappings held by other processes stay valid
+            self._sync()
+        else:
+            matrix = np.zeros((self._capacity, self.dim), dtype=np.float32)
+            matrix[:len(self._keys)] = self._matrix[:len(self._keys)]
+            self._matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def add(self, keys: list[str], vectors: "np.ndarray") -> int:
+        """Store vectors for keys not stored yet, up to ``max_rows``. Returns how many were added."""
+        with self._lock, self._file_lock():
+            if self.path:
+                self._sync()
+            new = {}
+            for key, vector in zip(keys, vectors):
+                if key not in self._rows:
+                    new.setdefault(key, vector)
+            room = self.max_rows - len(self._keys)
+            if len(new) > room:
+                if not self._full_logged:
+                    print(f"Vector store full ({self.max_rows} rows), new embeddings are no longer stored.")
+                    self._full_logged = True
+                new = dict(list(new.items())[:max(0, room)])
+            if not new:
+                return 0
+            needed = len(self._keys) + len(new)
+            if needed > self._matrix.shape[0]:
+                self._grow(needed)
+            first = len(self._keys)
+            for row, (key, vector) in enumerate(new.items(), first):
+                self._matrix[row] = vector
+                self._rows[key] = row
+                self._keys.append(key)
+            if self.path:
+                # Rows first, then their keys, so readers never see a key without its vector
+                self._matrix.flush()
+                with open(f"{self.path}.keys", "a") as f:
+                    f.write("".join(f"{key}\n" for key in new))
+                    self._keys_read = f.tell()
+            return len(new)
+
+    def top_k(self, queries: "np.ndarray", k: int, keys: list[str] = None) -> list[list[tuple[str, float]]]:
+        """
+        Cosine top-``k`` for each query row, as (key, similarity) best first.
+        ``keys`` restricts the search to those rows.
+        """
+        with self._lock:
+            if self.path:
+                with self._file_lock(shared=True):
+                    self._sync()
+            if keys is None:
+                keys = list(self._keys)
+                matrix = self._matrix[:len(keys)]
+            else:
+                keys = [key for key in keys if key in self._rows]
+                matrix = self._matrix[[self._rows[key] for key in keys]]
+        if not keys:
+            return [[] for _ in range(len(queries))]
+        import numpy as np
+        k = min(k, len(keys))
+        sims = np.asarray(queries, dtype=np.float32) @ matrix.T
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        results = []
+        for row, idx in zip(sims, top):
+            idx = idx[np.argsort(-row[idx])]
+            results.append([(keys[i], float(row[i])) for i in idx])
+        return results
+
+
+def _make_embedder():
+    backend = EMBEDDERS.get(EMBEDDING_BACKEND)
+    if backend is None:
+        print(f"WARNING: unknown EMBEDDING_BACKEND {EMBEDDING_BACKEND!r}, using hashing.")
+        backend = HashingEmbedder
+    return backend()
+
+
+def _open_vector_store():
+    embedder = get_embedder()
+    path = None if VECTOR_STORE_PATH.lower() == "none" else f"{VECTOR_STORE_PATH}-{embedder.name}-{embedder.dim}"
+    if path and fcntl is None:
+        path += f"-{os.getpid()}"
+    try:
+        return VectorStore(embedder.dim, path)
+    except (OSError, ValueError) as e:
+        print(f"WARNING: vector store unavailable at {path} ({e}), keeping embeddings in memory.")
+        return VectorStore(embedder.dim)
+
+
+def get_embedder():
+    return warm("embedder", _make_embedder)
+
+
+def get_vector_store():
+    """The process-wide vector store, opened from VECTOR_STORE_PATH on first use."""
+    return warm("vector_store", _open_vector_store)
+
+
+def semantic_prerank(query: str, candidates: list[CandidateRecord],
+                     k: int) -> tuple[list[CandidateRecord], list[CandidateRecord]]:
+    """
+    Split ``candidates`` into the ``k`` most similar to ``query`` (best first)
+    and the rest. Profiles are embedded once, keyed by content hash.
+    """
+    embedder = get_embedder()
+    store = get_vector_store()
+    start = time.perf_counter()
+    keys = [CandidateStore.content_hash(c) for c in candidates]
+    missing = {key: cand for key, cand in zip(keys, candidates) if key not in store}
+    fresh = {}
+    if missing:
+        texts = [f"{c.title or ''} {c.content or ''}" for c in missing.values()]
+        fresh = dict(zip(missing, embedder.embed(texts)))
+        store.add(list(fresh), list(fresh.values()))
+
+    query_vector = embedder.embed([query])
+    ranked = store.top_k(query_vector, len(keys), keys=keys)[0]
+    # Profiles a full store didn't keep are ranked from their fresh embeddings
+    unstored = [(key, float(vector @ query_vector[0])) for key, vector in fresh.items() if key not in store]
+    if unstored:
+        ranked = sorted(ranked + unstored, key=lambda item: item[1], reverse=True)
+    order = {key: rank for rank, (key, _) in enumerate(ranked)}
+    by_rank = sorted(range(len(candidates)), key=lambda i: order.get(keys[i], len(order)))
+    shortlist = [candidates[i] for i in by_rank[:k]]
+    remainder = [candidates[i] for i in by_rank[k:]]
+    print(f"Semantic pre-rank: {len(candidates)} candidates -> top {len(shortlist)} for Gemini "
+          f"({len(missing)} newly embedded, {(time.perf_counter() - start) * 1000:.0f} ms)")
+    return shortlist, remainder
@@ -0,0 +1,121 @@
+"""SQLite store of every candidate profile the pipeline has seen."""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+from .candidate import CandidateRecord
+from .heuristic import extract_profile_features
+from .warm import warm
+
+
+class CandidateStore:
+    """
+    SQLite store of every profile the pipeline has seen, keyed by URL.
+    Keeps the cleaned title, content and image, the query-independent
+    features from ``extract_profile_features`` and a content hash. When a
+    profile comes back with unchanged content its stored features are
+    reused and only the query-dependent scoring runs again. Local search
+    over the stored profiles is the BM25 index in ``scout.index``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                content TEXT,
+                image TEXT,
+                skills TEXT,
+                companies TEXT,
+                features TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(candidate: CandidateRecord) -> str:
+        text = f"{candidate.title or ''}\0{candidate.content or ''}"
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def upsert_many(self, candidates: list[CandidateRecord]) -> list[dict]:
+        """Store candidates and return their features, in input order."""
+        if not candidates:
+            return []
+        urls = [c.url for c in candidates]
+        now = time.time()
+        features_out = []
+        reused = 0
+
+        with self._lock:
+            placeholders = ",".join("?" * len(urls))
+            existing = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute(
+                    f"SELECT url, content_hash, features FROM profiles WHERE url IN ({placeholders})", urls
+                )
+            }
+            for cand in candidates:
+                url = cand.url
+                digest = self.content_hash(cand)
+                row = existing.get(url)
+                if row is not None and row[0] == digest:
+                    features = json.loads(row[1])
+                    self._conn.execute("UPDATE profiles SET last_seen = ? WHERE url = ?", (now, url))
+                    reused += 1
+                else:
+                    features = extract_profile_features(cand)
+                    self._conn.execute(
+                        "INSERT INTO profiles (url, title, content, image, skills, companies, features, "
+                        "content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(url) DO UPDATE SET title = excluded.title, content = excluded.content, "
+                        "image = COALESCE(excluded.image, profiles.image), skills = excluded.skills, "
+                        "companies = excluded.companies, features = excluded.features, "
+                        "content_hash = excluded.content_hash, last_seen = excluded.last_seen",
+                        (url, cand.title, cand.content, cand.image,
+                         json.dumps(features["skills"]), json.dumps(features["companies"]),
+                         json.dumps(features), digest, now, now)
+                    )
+                    existing[url] = (digest, json.dumps(features))
+                features_out.append(features)
+            self._conn.commit()
+
+        print(f"Candidate store: {reused}/{len(candidates)} profiles unchanged, features reused")
+        return features_out
+
+    def iter_profiles(self):
+        """Yield every stored profile as a candidate record."""
+        with self._lock:
+            rows = self._conn.execute("SELECT url, title, content, image FROM profiles").fetchall()
+        for r in rows:
+            yield CandidateRecord(r[0], r[1], r[2], r[3])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+
+def _make_candidate_store():
+    """Open the store at CANDIDATE_STORE_PATH ("none" disables it)."""
+    path = os.getenv("CANDIDATE_STORE_PATH", "/tmp/scout_candidates.sqlite3")
+    if path.lower() == "none":
+        return None
+    try:
+        return CandidateStore(path)
+    except sqlite3.Error as e:
+        print(f"WARNING: candidate store unavailable at {path} ({e}), continuing without it.")
+        return None
+
+
+def get_candidate_store():
+    """The process-wide candidate store (None when disabled), opened on first use."""
+    return warm("candidate_store", _make_candidate_store)
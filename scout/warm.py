@@ -0,0 +1,29 @@
+"""Process-wide objects built on first use and kept for the life of the process."""
+
+import time
+import threading
+
+from .metrics import metrics
+
+
+# API clients, indexes and stores are built on first use rather than at
+# import, and the heavy SDKs (google-genai, tavily, numpy, requests) are
+# only imported then, so a cold start pays just for what its first request
+# touches. Everything built here lives in ``warm_state`` for the life of the
+# process, so later invocations on a warm serverless instance reuse it.
+warm_state = {}
+_warm_state_lock = threading.RLock()  # factories may build other warm objects
+
+
+def warm(name: str, factory):
+    """Return the process-wide ``name`` object, building it with ``factory`` on first use."""
+    if name in warm_state:
+        return warm_state[name]
+    with _warm_state_lock:
+        if name not in warm_state:
+            start = time.perf_counter()
+            warm_state[name] = factory()
+            elapsed = time.perf_counter() - start
+            metrics.observe("scout_warm_init_seconds", elapsed, component=name)
+            print(f"Warm state: built {name} in {elapsed * 1000:.0f} ms")
+    return warm_state[name]
@@ -0,0 +1,11 @@
+import os
+
+# Keep the tests off the disk caches and stores the agent uses by default
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+os.environ.setdefault("GEMINI_CACHE_BACKEND", "none")
+os.environ.setdefault("TAVILY_CACHE_BACKEND", "none")
+os.environ.setdefault("CANDIDATE_STORE_PATH", "none")
+os.environ.setdefault("VECTOR_STORE_PATH", "none")
+os.environ.setdefault("JOB_QUEUE_PATH", "none")
+os.environ.setdefault("GEMINI_RPM", "0")
@@ -0,0 +1,84 @@
+import json
+
+from scout.jsonstream import JsonArrayParser
+
+
+ITEMS = [
+    {"url": "https://www.linkedin.com/in/a", "reason": 'Says "hi" \\ waves', "skills": ["Python", "Go"]},
+    {"url": "https://www.linkedin.com/in/b", "reason": "Uses {braces} and [brackets] in prose", "score": 7},
+    {"url": "https://www.linkedin.com/in/c", "nested": {"list": [1, {"deep": "]}"}]}, "reason": "é ✓"},
+]
+TEXT = json.dumps(ITEMS, ensure_ascii=False)
+
+
+def feed_all(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items += parser.feed(chunk)
+    return items
+
+
+def test_whole_array_in_one_chunk():
+    parser = JsonArrayParser()
+    assert parser.feed(TEXT) == ITEMS
+    assert parser.done and not parser.pending and parser.skipped == 0
+
+
+def test_every_split_point():
+    # Covers splits inside strings, between a backslash and the character it escapes, and mid-brace
+    for cut in range(len(TEXT) + 1):
+        parser = JsonArrayParser()
+        assert feed_all(parser, [TEXT[:cut], TEXT[cut:]]) == ITEMS, cut
+        assert parser.done
+
+
+def test_one_character_at_a_time():
+    parser = JsonArrayParser()
+    assert feed_all(parser, TEXT) == ITEMS
+    assert parser.done
+
+
+def test_split_escape_before_quote():
+    parser = JsonArrayParser()
+    assert parser.feed('[{"reason": "ends with \\') == []
+    assert parser.pending
+    assert parser.feed('"", "x": "}"}]') == [{"reason": 'ends with "', "x": "}"}]
+
+
+def test_items_returned_as_soon_as_they_close():
+    parser = JsonArrayParser()
+    first, rest = TEXT.split("}, {", 1)
+    assert parser.feed(first + "}, {") == ITEMS[:1]
+    assert parser.feed(rest) == ITEMS[1:]
+
+
+def test_text_before_the_array_is_ignored():
+    parser = JsonArrayParser()
+    assert feed_all(parser, ["```json\n", TEXT, "\n```"]) == ITEMS
+
+
+def test_malformed_element_is_skipped_without_losing_neighbours():
+    parser = JsonArrayParser()
+    text = '[{"url": "a"}, {"url": "b", oops}, {"url": "c"}]'
+    assert feed_all(parser, [text[:20], text[20:]]) == [{"url": "a"}, {"url": "c"}]
+    assert parser.skipped == 1 and parser.done
+
+
+def test_non_object_element_is_skipped():
+    parser = JsonArrayParser()
+    assert parser.feed('[[1, 2], {"url": "a"}]') == [{"url": "a"}]
+    assert parser.skipped == 1
+
+
+def test_truncated_stream_keeps_completed_items():
+    parser = JsonArrayParser()
+    cut = TEXT.index('"https://www.linkedin.com/in/c"') + 10
+    assert feed_all(parser, [TEXT[:cut]]) == ITEMS[:2]
+    assert parser.pending and not parser.done
+
+
+def test_input_after_the_closing_bracket_is_ignored():
+    parser = JsonArrayParser()
+    assert parser.feed('[{"url": "a"}] {"url": "b"}') == [{"url": "a"}]
+    assert parser.feed('{"url": "c"}') == []
+    assert parser.done
@@ -0,0 +1,62 @@
+import re
+import json
+import types
+import asyncio
+
+import pytest
+
+import scout
+
+LATENCY = 0.05
+PROFILES = [
+    {"title": f"Candidate {i} - Senior Python Engineer | LinkedIn", "url": f"https://www.linkedin.com/in/candidate-{i}",
+     "content": "Senior Python engineer, 6 years at Acme. Django, AWS, Docker, PostgreSQL."}
+    for i in range(8)
+]
+
+
+def stub_clients():
+    """Gemini and Tavily stand-ins that answer after LATENCY seconds."""
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    def answer(contents, config):
+        if config:  # structured scoring request
+            urls = dict.fromkeys(re.findall(r"https://www\.linkedin\.com/in/[\w-]+", contents))
+            return json.dumps([{"url": url, "score": 80 - i, "reason": "Python and AWS.", "confidence": "High",
+                                "skills": ["Python", "AWS"]} for i, url in enumerate(urls)])
+        return "Senior Python engineer with Django and AWS."
+
+    async def generate_content(model, contents, config=None):
+        await asyncio.sleep(LATENCY)
+        return Response(answer(contents, config))
+
+    async def generate_content_stream(model, contents, config=None):
+        response = await generate_content(model, contents, config)
+
+        async def chunks():
+            for i in range(0, len(response.text), 100):
+                yield Response(response.text[i:i + 100])
+        return chunks()
+
+    async def search(**kwargs):
+        await asyncio.sleep(LATENCY)
+        return {"results": PROFILES}
+
+    models = types.SimpleNamespace(generate_content=generate_content, generate_content_stream=generate_content_stream)
+    return types.SimpleNamespace(aio=types.SimpleNamespace(models=models)), types.SimpleNamespace(search=search)
+
+
+@pytest.mark.parametrize("deadline", [8, 12, 50])
+def test_short_deadline_still_returns_candidates(deadline, monkeypatch):
+    gemini, tavily = stub_clients()
+    monkeypatch.setitem(scout.warm_state, "gemini_client", gemini)
+    monkeypatch.setitem(scout.warm_state, "tavily_client", tavily)
+    description = "Senior Python engineer with Django and AWS experience " * 10  # long enough to condense
+
+    result = asyncio.run(scout.run_recruitment_agent(description, deadline=deadline))
+
+    assert len(result["search_results"]) == len(PROFILES)
+    assert all(c.match_type == "candidate_profile" for c in result["search_results"])
+    assert "No matching candidates" not in result["analysis_report"]
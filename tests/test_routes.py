@@ -0,0 +1,43 @@
+import asyncio
+import sqlite3
+
+from scout import routes
+
+
+def test_worker_survives_queue_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(routes, "JOB_POLL_INTERVAL", 0.01)
+    queue = routes.JobQueue(str(tmp_path / "jobs.sqlite3"))
+    claim = queue.claim
+    calls = []
+
+    def flaky_claim():
+        calls.append(1)
+        if len(calls) <= 2:
+            raise sqlite3.OperationalError("database is locked")
+        return claim()
+
+    monkeypatch.setattr(queue, "claim", flaky_claim)
+
+    async def run_until_claimed():
+        queue.start()
+        for _ in range(200):
+            if len(calls) > 3:
+                break
+            await asyncio.sleep(0.01)
+        for worker in queue._workers:
+            worker.cancel()
+        return [worker for worker in queue._workers if worker.done() and not worker.cancelled()]
+
+    crashed = asyncio.run(run_until_claimed())
+    assert len(calls) > 3 and not crashed
+
+
+def test_stream_rejects_background_options():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+    for extra in ({"background": True}, {"callback_url": "https://example.com/hook"}, {"max_results": 5}):
+        response = client.post("/api/analyze/stream", json={"description": "Python engineer", **extra})
+        assert response.status_code == 422, extra
@@ -0,0 +1,44 @@
+import numpy as np
+
+from scout import semantic
+from scout.candidate import CandidateRecord
+from scout.semantic import VectorStore
+
+EYE = np.eye(4, dtype=np.float32)
+
+
+def test_stores_on_one_path_share_rows(tmp_path):
+    path = str(tmp_path / "vectors")
+    a = VectorStore(4, path, capacity=2)
+    b = VectorStore(4, path, capacity=2)
+    assert a.add(["A"], [EYE[0]]) == 1
+    assert b.add(["B", "C"], [EYE[1], EYE[2]]) == 2  # grows the file under a's mapping
+    assert a.top_k(EYE[[0, 2]], 1) == [[("A", 1.0)], [("C", 1.0)]]
+    assert b.top_k(EYE[[0]], 1) == [[("A", 1.0)]]
+    assert len(VectorStore(4, path)) == 3
+
+
+def test_full_store_keeps_existing_rows(tmp_path):
+    store = VectorStore(4, str(tmp_path / "vectors"), capacity=1, max_rows=2)
+    assert store.add(["A", "B", "C"], EYE[:3]) == 2
+    assert store.add(["D"], EYE[[3]]) == 0
+    assert len(store) == 2 and "C" not in store
+
+
+def test_without_fcntl(tmp_path, monkeypatch):
+    # Windows has no fcntl: the store must still work, on a per-process file
+    monkeypatch.setattr(semantic, "fcntl", None)
+    store = VectorStore(4, str(tmp_path / "vectors"), capacity=1)
+    assert store.add(["A", "B"], EYE[:2]) == 2
+    assert store.top_k(EYE[[1]], 1) == [[("B", 1.0)]]
+
+    monkeypatch.setattr(semantic, "VECTOR_STORE_PATH", str(tmp_path / "shared"))
+    opened = semantic._open_vector_store()
+    assert opened.path.endswith(f"-{semantic.os.getpid()}")
+
+    monkeypatch.setattr(semantic, "get_vector_store", lambda: opened)
+    candidates = [CandidateRecord(f"https://www.linkedin.com/in/{i}", f"Dev {i}", text)
+                  for i, text in enumerate(["go rust", "python django aws", "java spring", "python flask"])]
+    shortlist, remainder = semantic.semantic_prerank("python django", candidates, 2)
+    assert [c.url for c in shortlist][0] == "https://www.linkedin.com/in/1"
+    assert len(shortlist) == 2 and len(remainder) == 2